@@ -1,18 +1,20 @@
 from rest_framework import serializers
 
 from comments.models import Comment
-from project_management_tool.serializers import UserSerializer
+from project_management_tool.serializers import ExpandableFieldsMixin, UserSerializer
 from task.serializers import TaskSerializer
 
 
-class CommentSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
-    task = TaskSerializer(read_only=True)
+class CommentSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'user': (UserSerializer, {'read_only': True}),
+        'task': (TaskSerializer, {'read_only': True}),
+    }
 
     class Meta:
         model = Comment
-        fields = ['id', 'content', 'user', 'task', 'created_at']
-        read_only_fields = ['id', 'created_at']
+        fields = ['id', 'content', 'user', 'task', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'user', 'task', 'created_at', 'updated_at']
 
     def validate_content(self, value):
         if not value or not value.strip():
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from projects import events
+from projects.models import Tombstone
+from projects.revisions import bump_project_revision
+from task.models import Task
+
+
+def comment_project_id(comment):
+    if Comment.task.is_cached(comment):
+        return comment.task.project_id
+    return Task.objects.filter(id=comment.task_id).values_list('project_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, **kwargs):
+    bump_project_revision(Task.objects.filter(id=instance.task_id).values('project_id'))
+    # The project id costs a query, so only look it up when anyone listens.
+    if events.broker.has_subscribers():
+        events.publish(comment_project_id(instance), 'comment.saved', lambda: CommentSerializer(instance).data)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    project_id = comment_project_id(instance)
+    if project_id is None:
+        return
+    bump_project_revision([project_id])
+    Tombstone.objects.create(project_id=project_id, kind='comment', object_id=instance.pk)
+    events.publish(project_id, 'comment.deleted', lambda: {'id': instance.pk, 'task': instance.task_id})
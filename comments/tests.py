@@ -1,3 +1,31 @@
-from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from comments.models import Comment
+from project_management_tool.testing import ProjectFixtureMixin
+from task.models import Task
+
+
+class CommentRepresentationTests(ProjectFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(title='Task', description='', project=self.project)
+        self.comment = Comment.objects.create(content='Hello', user=self.user, task=self.task)
+        self.url = reverse('comment-detail', args=[self.comment.pk])
+
+    def test_relations_default_to_ids(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['user'], self.user.pk)
+        self.assertEqual(response.data['task'], self.task.pk)
+
+    def test_expand_nested_path(self):
+        response = self.client.get(self.url + '?expand=task.project,user')
+        self.assertEqual(response.data['user']['username'], 'owner')
+        self.assertEqual(response.data['task']['project']['id'], self.project.pk)
+        # Only the requested path is expanded.
+        self.assertEqual(response.data['task']['project']['owner'], self.user.pk)
+        self.assertIsNone(response.data['task']['assigned_to'])
+
+    def test_fields_restricts_output(self):
+        response = self.client.get(self.url + '?fields=id,content')
+        self.assertEqual(set(response.data), {'id', 'content'})
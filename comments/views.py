@@ -1,42 +1,39 @@
-from django.db import models
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 
 from comments.models import Comment
 from comments.serializers import CommentSerializer
-from projects.models import Project
+from project_management_tool.filters import IndexedFilterBackend, id_value
+from project_management_tool.replicas import ReplicaReadMixin
+from projects.access import accessible_project_ids
 from task.models import Task
 
 
 # Create your views here.
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [IndexedFilterBackend]
+    filter_fields = {
+        'task': ('task_id', id_value),
+        'user': ('user_id', id_value),
+    }
+    ordering_fields = ['-created_at', 'created_at', '-updated_at', 'updated_at']
 
     def get_queryset(self):
+        project_ids = accessible_project_ids(self.request.user)
         task_id = self.kwargs.get('task_pk')
         if task_id:
-            return Comment.objects.filter(task_id=task_id)
-        return Comment.objects.filter(
-            task__project__in=Project.objects.filter(
-                models.Q(owner=self.request.user) |
-                models.Q(members__user=self.request.user)
-            ).distinct()
-        )
+            return Comment.objects.filter(task_id=task_id, task__project_id__in=project_ids)
+        return Comment.objects.filter(task__project_id__in=project_ids)
 
     def perform_create(self, serializer):
         task_id = self.kwargs.get('task_pk')
         if task_id:
             # Ensure user has access to the task's project
             task = get_object_or_404(
-                Task.objects.filter(
-                    id=task_id,
-                    project__in=Project.objects.filter(
-                        models.Q(owner=self.request.user) |
-                        models.Q(members__user=self.request.user)
-                    )
-                )
+                Task.objects.filter(id=task_id, project_id__in=accessible_project_ids(self.request.user))
             )
             serializer.save(task=task, user=self.request.user)
         else:
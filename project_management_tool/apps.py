@@ -0,0 +1,11 @@
+from django.apps import AppConfig, apps
+
+
+class ProjectManagementToolConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'project_management_tool'
+
+    def ready(self):
+        from project_management_tool import db  # noqa: F401
+        if apps.is_installed('drf_spectacular'):
+            from project_management_tool import schema  # noqa: F401
@@ -0,0 +1,25 @@
+"""
+URL configuration for requests served over ASGI.
+
+The hot read endpoints are routed to their async views (which hand writes to
+the sync viewsets) and the project event streams live here only, since they
+hold a connection open; everything else falls through to ``urls.urlpatterns``.
+``AsgiUrlconfMiddleware`` selects this module for ASGI requests.
+"""
+from django.urls import include, path
+
+from project_management_tool import urls
+from projects.async_views import ProjectEventsView, ProjectListView
+from task.async_views import TaskCommentsView, TaskListView
+
+urlpatterns = [
+    path('api/projects', include([
+        path('projects/', ProjectListView.as_view()),
+        path('projects/<pk>/events/', ProjectEventsView.as_view(), name='project-events'),
+    ])),
+    path('api/task', include([
+        path('tasks/', TaskListView.as_view()),
+        path('tasks/<pk>/comments/', TaskCommentsView.as_view()),
+    ])),
+    *urls.urlpatterns,
+]
@@ -0,0 +1,74 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from rest_framework.response import Response
+
+
+class AsyncReadView(View):
+    """
+    Async version of a DRF viewset's read action, served under ASGI.
+
+    The viewset still does what it is configured to do around the action
+    (authentication, permissions, content negotiation, exception handling),
+    in a worker thread because those steps may query the database. The page
+    itself is read with the async ORM API and serialized and rendered on the
+    event loop. Other methods go to the sync viewset, so the view can take
+    over the viewset's whole route (see ``project_management_tool.asgi_urls``).
+
+    Subclasses set ``viewset`` and ``actions`` (as passed to
+    ``ViewSet.as_view()``) and implement the ``actions['get']`` coroutine;
+    ``viewset_initkwargs`` override viewset attributes such as renderers.
+    """
+    viewset = None
+    actions = {}
+    viewset_initkwargs = {}
+    sync_view = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        initkwargs.setdefault('sync_view', cls.viewset.as_view(cls.actions))
+        view = super().as_view(**initkwargs)
+        # Like DRF views: requests authenticate with a token, not the session cookie.
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            return await self.get(request, *args, **kwargs)
+        return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        view = self.viewset(**self.viewset_initkwargs)
+        view.action_map = self.actions
+        view.args = args
+        view.kwargs = kwargs
+        view.headers = view.default_response_headers
+        self.view = view
+        self.request = view.request = view.initialize_request(request, *args, **kwargs)
+
+        try:
+            await sync_to_async(view.initial)(self.request, *args, **kwargs)
+            response = await getattr(self, view.action)(self.request, *args, **kwargs)
+        except Exception as exc:
+            response = await sync_to_async(view.handle_exception)(exc)
+        return self.finalize_response(view.finalize_response(self.request, response, *args, **kwargs))
+
+    def finalize_response(self, response):
+        if not isinstance(response, Response):
+            return response
+        response.render()
+        # Django renders unrendered responses in a worker thread; hand it plain bytes.
+        return HttpResponse(response.content, status=response.status_code, headers=response.headers)
+
+    async def serialize(self, serializer):
+        # Expanded relations are loaded lazily, which the event loop does not allow.
+        if self.request.query_params.get('expand'):
+            return await sync_to_async(lambda: serializer.data)()
+        return serializer.data
+
+    async def list(self, request, *args, **kwargs):
+        queryset = self.view.filter_queryset(await sync_to_async(self.view.get_queryset)())
+        page = await self.view.paginator.apaginate_queryset(queryset, request, view=self.view)
+        serializer = self.view.get_serializer(page, many=True)
+        return self.view.get_paginated_response(await self.serialize(serializer))
@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from project_management_tool.local_cache import TTLCache
+
+User = get_user_model()
+
+# Claims ClaimsRefreshToken adds next to the user id, copied onto access tokens.
+USER_CLAIMS = ('username', 'is_staff', 'is_superuser')
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry enough claims to rebuild the user."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+# user id -> (is_active, is_staff, is_superuser, password) or None if deleted.
+user_states = TTLCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TIMEOUT)
+
+
+def forget_user_state(sender, instance, **kwargs):
+    # Other processes notice the change once their entry expires.
+    user_states.delete(instance.pk)
+
+
+post_save.connect(forget_user_state, sender=User, dispatch_uid='forget_user_state_on_save')
+post_delete.connect(forget_user_state, sender=User, dispatch_uid='forget_user_state_on_delete')
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that rebuilds ``request.user`` from token claims.
+
+    The user is a ``User`` instance holding only the claimed fields; any other
+    field is loaded from the database on first access, as with ``.only()``.
+    Whether the user still exists, is active and still has the claimed
+    privileges is checked against ``user_states``, so the database is asked at
+    most once per user and ``AUTH_USER_CACHE_TIMEOUT`` in each process.
+    Tokens issued without the claims fall back to a full lookup.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        state = user_states.get(user_id, default=False)
+        if state is False:
+            state = User.objects.filter(pk=user_id).values_list(
+                'is_active', 'is_staff', 'is_superuser', 'password'
+            ).first()
+            user_states.set(user_id, state)
+
+        if state is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        is_active, is_staff, is_superuser, password = state
+        if not is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if (validated_token['is_staff'], validated_token['is_superuser']) != (is_staff, is_superuser):
+            raise AuthenticationFailed(_("The user's permissions have changed."), code='claims_changed')
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        claimed = {
+            'id': user_id,
+            'username': validated_token['username'],
+            'is_active': is_active,
+            'is_staff': is_staff,
+            'is_superuser': is_superuser,
+        }
+        # from_db() expects values in field order and defers the missing ones.
+        field_names = [field.attname for field in User._meta.concrete_fields if field.attname in claimed]
+        return User.from_db(DEFAULT_DB_ALIAS, field_names, [claimed[name] for name in field_names])
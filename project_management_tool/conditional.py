@@ -0,0 +1,64 @@
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def _validate(request, validators):
+    revision, updated_at = validators
+    # The representation also depends on ?fields=/?expand=/?cursor= and content negotiation.
+    variant = hashlib.md5(
+        f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}".encode()
+    ).hexdigest()[:16]
+    etag = quote_etag(f'{revision}-{variant}')
+    last_modified = int(updated_at.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return etag, last_modified, response
+
+
+def _stamp(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def conditional_on_revision(get_validators):
+    """
+    Serve conditional GETs for a viewset action from a cheap version stamp.
+
+    ``get_validators(view, **kwargs)`` returns ``(revision, updated_at)`` for
+    the project the response depends on, or ``None`` to fall through to the
+    action (which then raises the usual 404). When the client's
+    ``If-None-Match``/``If-Modified-Since`` still match, a 304 is returned
+    without running the action or serializing anything.
+
+    Coroutine actions (see ``project_management_tool.async_views``) take a
+    coroutine ``get_validators`` as well.
+    """
+    def decorator(method):
+        if iscoroutinefunction(method):
+            @wraps(method)
+            async def async_wrapper(self, request, *args, **kwargs):
+                validators = await get_validators(self, **kwargs)
+                if validators is None:
+                    return await method(self, request, *args, **kwargs)
+                etag, last_modified, response = _validate(request, validators)
+                if response is None:
+                    response = await method(self, request, *args, **kwargs)
+                return _stamp(response, etag, last_modified)
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            validators = get_validators(self, **kwargs)
+            if validators is None:
+                return method(self, request, *args, **kwargs)
+            etag, last_modified, response = _validate(request, validators)
+            if response is None:
+                response = method(self, request, *args, **kwargs)
+            return _stamp(response, etag, last_modified)
+        return wrapper
+    return decorator
@@ -0,0 +1,21 @@
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# WAL lets readers run alongside the writer and, with synchronous=NORMAL,
+# commits no longer wait for an fsync (a power loss may drop the last ones).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
+}
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Run the ``PRAGMAS`` of a SQLite database's settings on each new connection."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in connection.settings_dict.get('PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {name} = {value}')
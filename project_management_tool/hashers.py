@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, ScryptPasswordHasher
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    Scrypt with the work factor taken from ``PASSWORD_SCRYPT_WORK_FACTOR``.
+
+    Memory-hard: each hash needs ``128 * work_factor * block_size`` bytes
+    (16 MiB by default), which costs attackers far more than it costs the
+    server in CPU time. Hashes made with another work factor are upgraded
+    on the next successful login.
+    """
+    # Room for verifying hashes stored with a higher work factor than configured.
+    maxmem = 256 * 1024 * 1024
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with ``PASSWORD_PBKDF2_ITERATIONS`` iterations."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
@@ -0,0 +1,44 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def delete_now_and_on_commit(delete_many, keys):
+    """
+    Call ``delete_many(keys)`` now and again once the current transaction
+    commits: a concurrent request may have cached the pre-commit state in
+    between. Outside a transaction the second call runs immediately.
+    """
+    if not keys:
+        return
+    delete_many(keys)
+    transaction.on_commit(lambda: delete_many(keys))
+
+
+class PerUserCache:
+    """
+    One entry per user in the default cache, stored under ``<prefix>:<user id>``
+    for ``timeout_setting`` seconds. Bump ``version`` when the value changes
+    shape so stale entries are ignored.
+    """
+
+    def __init__(self, prefix, version, timeout_setting):
+        self.prefix = prefix
+        self.version = version
+        self.timeout_setting = timeout_setting
+
+    def key(self, user_id):
+        return f'{self.prefix}:{user_id}'
+
+    def get(self, user_id):
+        return cache.get(self.key(user_id), version=self.version)
+
+    def set(self, user_id, value):
+        cache.set(self.key(user_id), value, getattr(settings, self.timeout_setting), version=self.version)
+
+    def invalidate(self, *user_ids):
+        """Drop the entries of the given users."""
+        keys = [self.key(user_id) for user_id in set(user_ids) if user_id is not None]
+        delete_now_and_on_commit(partial(cache.delete_many, version=self.version), keys)
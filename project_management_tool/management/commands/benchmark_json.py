@@ -0,0 +1,98 @@
+import io
+import timeit
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from project_management_tool.parsers import FastJSONParser
+from project_management_tool.renderers import FastJSONRenderer, orjson
+from projects.models import Project
+from projects.querysets import with_project_graph
+from projects.serializers import ProjectSerializer
+from task.management.commands import benchmark_indexes
+from task.models import Task
+from task.querysets import with_task_graph
+from task.serializers import TaskSerializer
+
+CODECS = {
+    'json': (JSONRenderer(), JSONParser()),
+    'orjson': (FastJSONRenderer(), FastJSONParser()),
+}
+
+
+class Command(benchmark_indexes.Command):
+    help = (
+        'Measure encode and decode time and encoded size of realistic project, task '
+        'and comment pages with the stdlib JSON renderer/parser and the orjson ones.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=2_000)
+        parser.add_argument('--comments', type=int, default=2_000)
+        parser.add_argument('--projects', type=int, default=20)
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--number', type=int, default=200, help='Calls per timing run.')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows afterwards.')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write('orjson is not installed; both columns measure the stdlib json module.')
+        users, projects = self.seed(options)
+        try:
+            payloads = self.payloads(projects, options['page_size'])
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                'Microseconds per call, best of %d x %d' % (options['repeat'], options['number'])
+            ))
+            self.stdout.write(
+                f"  {'payload':<30}{'bytes':>10}" + ''.join(
+                    f'{f"{step} {codec}":>16}' for step in ('encode', 'decode') for codec in CODECS
+                )
+            )
+            for name, data in payloads.items():
+                row = self.measure(data, options['repeat'], options['number'])
+                self.stdout.write(f'  {name:<30}{row["bytes"]:>10}' + ''.join(
+                    f'{row[step, codec]:16.1f}' for step in ('encode', 'decode') for codec in CODECS
+                ))
+        finally:
+            if not options['keep']:
+                self.cleanup()
+
+    def payloads(self, projects, page_size):
+        """Pages as the list endpoints return them, ids only and with relations expanded."""
+        project_ids = [project.pk for project in projects]
+        querysets = {
+            'projects': (ProjectSerializer, with_project_graph(Project.objects.filter(pk__in=project_ids)),
+                         ['owner', 'members.user']),
+            'tasks': (TaskSerializer, with_task_graph(Task.objects.filter(project_id__in=project_ids)),
+                      ['assigned_to', 'project.owner', 'project.members.user']),
+            'comments': (CommentSerializer, with_task_graph(
+                Comment.objects.filter(task__project_id__in=project_ids).select_related('user'), prefix='task__'
+            ), ['user', 'task.assigned_to', 'task.project']),
+        }
+
+        payloads = {}
+        for name, (serializer_class, queryset, expand) in querysets.items():
+            page = list(queryset.order_by('-created_at')[:page_size])
+            for label, paths in (('', []), (', expanded', expand)):
+                payloads[f'{name} ({len(page)}{label})'] = {
+                    'next': 'http://localhost:8000/api/?cursor=cD0yMDI2LTAxLTAx',
+                    'previous': None,
+                    'results': serializer_class(page, many=True, expand=paths).data,
+                }
+        return payloads
+
+    def measure(self, data, repeat, number):
+        row = {}
+        for codec, (renderer, parser) in CODECS.items():
+            encoded = renderer.render(data)
+            row['bytes'] = len(encoded)
+            row['encode', codec] = self.best(lambda: renderer.render(data), repeat, number)
+            row['decode', codec] = self.best(lambda: parser.parse(io.BytesIO(encoded)), repeat, number)
+        return row
+
+    def best(self, call, repeat, number):
+        return min(timeit.repeat(call, repeat=repeat, number=number)) / number * 1_000_000
@@ -0,0 +1,64 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from project_management_tool.throttling import TokenBucketThrottle
+
+USERNAME = 'bench_login_user'
+PASSWORD = 'bench-login-password'
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure logins per second on one core (one request at a time) with each '
+        'configured password hasher as the preferred one.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20, help='Logins per hasher.')
+        parser.add_argument('--hashers', nargs='+', default=['scrypt', 'pbkdf2_sha256', 'argon2'],
+                            help='Algorithms to measure, as in the stored hashes.')
+
+    def handle(self, *args, **options):
+        by_algorithm = {import_string(path).algorithm: path for path in settings.PASSWORD_HASHERS}
+        client = Client()
+        url = reverse('user-login')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Logins per second on one core (%d logins)' % options['logins']))
+        self.stdout.write(f"  {'hasher':<16}{'hash ms':>10}{'logins/s':>10}")
+        # The test client sends Host: testserver; the throttles would stop the run early.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']), \
+                mock.patch.object(TokenBucketThrottle, 'THROTTLE_RATES', {}):
+            for algorithm in options['hashers']:
+                if algorithm not in by_algorithm:
+                    self.stderr.write(f'  {algorithm}: not in PASSWORD_HASHERS, skipped')
+                    continue
+                preferred = by_algorithm[algorithm]
+                hashers = [preferred, *(path for path in settings.PASSWORD_HASHERS if path != preferred)]
+                with override_settings(PASSWORD_HASHERS=hashers):
+                    try:
+                        started = time.perf_counter()
+                        get_hasher().encode(PASSWORD, get_hasher().salt())
+                        hash_time = time.perf_counter() - started
+                    except ValueError as exc:  # the hasher's library is not installed
+                        self.stderr.write(f'  {algorithm}: {exc}, skipped')
+                        continue
+                    User.objects.filter(username=USERNAME).delete()
+                    User.objects.create_user(username=USERNAME, password=PASSWORD)
+                    try:
+                        started = time.perf_counter()
+                        for _ in range(options['logins']):
+                            response = client.post(url, {'username': USERNAME, 'password': PASSWORD})
+                            if response.status_code != 200:
+                                raise RuntimeError(f'login failed: HTTP {response.status_code}')
+                        rate = options['logins'] / (time.perf_counter() - started)
+                    finally:
+                        User.objects.filter(username=USERNAME).delete()
+                self.stdout.write(f'  {algorithm:<16}{hash_time * 1000:10.1f}{rate:10.1f}')
@@ -0,0 +1,81 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter per sample, so nothing is imported or cached beforehand.
+CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+import django
+from django.conf import settings
+django.setup()
+setup = time.perf_counter() - started
+
+from django.test import Client, override_settings
+from django.urls import get_resolver, reverse
+from project_management_tool.throttling import TokenBucketThrottle
+started = time.perf_counter()
+get_resolver()._populate()
+url = reverse('project-list')
+urls = time.perf_counter() - started
+
+TokenBucketThrottle.THROTTLE_RATES = {}
+with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+    client = Client()
+    started = time.perf_counter()
+    assert client.get(url).status_code == 401
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(%(requests)d):
+        client.get(url)
+    per_request = (time.perf_counter() - started) / %(requests)d
+
+print(json.dumps({'setup': setup, 'urls': urls, 'first': first, 'request': per_request,
+                  'modules': len(sys.modules), 'middleware': len(settings.MIDDLEWARE),
+                  'apps': len(settings.INSTALLED_APPS)}))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure cold start (imports, django.setup(), URL resolver) and per-request '
+        'overhead of an unauthenticated API request under each settings module.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--settings-modules', nargs='+',
+                            default=['project_management_tool.settings', 'project_management_tool.settings_api'])
+        parser.add_argument('--runs', type=int, default=5, help='Fresh processes per settings module.')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per process.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            'Median of %d processes; requests are unauthenticated GETs of the project list (401)' % options['runs']
+        ))
+        self.stdout.write(
+            f"  {'settings':<40}{'apps':>6}{'mw':>4}{'modules':>9}"
+            f"{'setup ms':>10}{'urls ms':>9}{'1st req ms':>12}{'req us':>9}"
+        )
+        for module in options['settings_modules']:
+            runs = [self.run(module, options['requests']) for _ in range(options['runs'])]
+            median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+            self.stdout.write(
+                f"  {module:<40}{median['apps']:>6.0f}{median['middleware']:>4.0f}{median['modules']:>9.0f}"
+                f"{median['setup'] * 1000:10.1f}{median['urls'] * 1000:9.1f}"
+                f"{median['first'] * 1000:12.1f}{median['request'] * 1_000_000:9.0f}"
+            )
+
+    def run(self, module, requests):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': module, 'PYTHONWARNINGS': 'ignore'}
+        result = subprocess.run(
+            [sys.executable, '-c', CHILD % {'requests': requests}],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'{module} failed:\n{result.stderr}')
+        return json.loads(result.stdout.strip().splitlines()[-1])
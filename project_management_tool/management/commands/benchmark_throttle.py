@@ -0,0 +1,58 @@
+import timeit
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import AnonRateThrottle
+
+from project_management_tool.throttling import AnonTokenBucketThrottle, TokenBucketThrottle, local_buckets
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the cost of one throttle check: the token-bucket throttle on the '
+        'configured cache and on in-process buckets, against DRF\'s AnonRateThrottle.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=1000, help='Distinct client addresses.')
+        parser.add_argument('--number', type=int, default=20_000, help='Checks per timing run.')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        requests = []
+        for client in range(options['clients']):
+            address = f'10.{client >> 16 & 255}.{client >> 8 & 255}.{client & 255}'
+            request = Request(factory.post('/', REMOTE_ADDR=address))
+            request.user = AnonymousUser()
+            requests.append(request)
+
+        # High enough that every check is allowed and does its full work.
+        rates = {'anon': '1000000/min'}
+        cases = {
+            'token bucket, cache': (AnonTokenBucketThrottle, {}),
+            'token bucket, in-process': (AnonTokenBucketThrottle, {'THROTTLE_CACHE_ALIAS': None}),
+            'DRF AnonRateThrottle': (AnonRateThrottle, {}),
+        }
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            'Microseconds per check, best of %d x %d over %d clients' % (
+                options['repeat'], options['number'], options['clients'])
+        ))
+        for name, (throttle_class, overrides) in cases.items():
+            with override_settings(**overrides), \
+                    mock.patch.object(TokenBucketThrottle, 'THROTTLE_RATES', rates), \
+                    mock.patch.object(AnonRateThrottle, 'THROTTLE_RATES', rates):
+                throttle = throttle_class()
+                cycle = iter(requests * (options['number'] * options['repeat'] // len(requests) + 1))
+                best = min(timeit.repeat(
+                    lambda: throttle.allow_request(next(cycle), None),
+                    repeat=options['repeat'], number=options['number'],
+                ))
+                # Drop the benchmark's buckets only; the cache may be shared.
+                throttle.cache.delete_many({throttle.get_cache_key(request, None) for request in requests})
+                local_buckets.clear()
+            self.stdout.write(f'  {name:<28}{best / options["number"] * 1_000_000:10.2f}')
@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+from project_management_tool.db import SQLITE_PRAGMAS
+
+TABLE = 'bench_writes'
+PAYLOAD = 'x' * 200
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure concurrent write throughput of SQLite with default settings, SQLite '
+        'with the tuned PRAGMAS, and the configured database when it is not SQLite.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16],
+                            help='Numbers of concurrent writers to measure at.')
+        parser.add_argument('--writes', type=int, default=2000,
+                            help='Single-row write transactions per measurement.')
+
+    def handle(self, *args, **options):
+        directory = Path(tempfile.mkdtemp(prefix='bench_writes_'))
+        default = connections.settings[DEFAULT_DB_ALIAS]
+        sqlite = {**default, 'ENGINE': 'django.db.backends.sqlite3', 'OPTIONS': {}, 'CONN_MAX_AGE': 0}
+        modes = {
+            'sqlite': {**sqlite, 'NAME': directory / 'plain.sqlite3', 'PRAGMAS': {}},
+            'sqlite (tuned)': {**sqlite, 'NAME': directory / 'tuned.sqlite3', 'PRAGMAS': SQLITE_PRAGMAS},
+        }
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite':
+            modes[connections[DEFAULT_DB_ALIAS].vendor] = default
+
+        try:
+            results = {}
+            for mode, config in modes.items():
+                alias = f'bench_{len(results)}'
+                connections.settings[alias] = config
+                self.stdout.write(f'Measuring {mode}...')
+                results[mode] = [self.measure(alias, threads, options['writes']) for threads in options['threads']]
+
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                'Write transactions per second (errors), %d writes' % options['writes']
+            ))
+            self.stdout.write('  ' + f"{'writers':<16}" + ''.join(f'{threads:>16}' for threads in options['threads']))
+            for mode, rows in results.items():
+                cells = ''.join(f'{f"{rate:.0f} ({errors})":>16}' for rate, errors in rows)
+                self.stdout.write(f'  {mode:<16}{cells}')
+        finally:
+            for alias in [alias for alias in connections.settings if alias.startswith('bench_')]:
+                connections[alias].close()
+                del connections.settings[alias]
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def measure(self, alias, threads, writes):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+            cursor.execute(f'CREATE TABLE {TABLE} (worker integer, seq integer, payload text)')
+
+        def write(worker):
+            connection = connections[alias]
+            errors = 0
+            try:
+                for seq in range(worker, writes, threads):
+                    try:
+                        # Autocommit: every insert is its own transaction.
+                        with connection.cursor() as cursor:
+                            cursor.execute(f'INSERT INTO {TABLE} (worker, seq, payload) VALUES (%s, %s, %s)',
+                                           [worker, seq, PAYLOAD])
+                    except OperationalError:
+                        errors += 1
+            finally:
+                connection.close()
+            return errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            errors = sum(pool.map(write, range(threads)))
+        elapsed = time.perf_counter() - started
+
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f'DROP TABLE {TABLE}')
+        return (writes - errors) / elapsed, errors
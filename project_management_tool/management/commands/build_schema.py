@@ -0,0 +1,47 @@
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+from project_management_tool import openapi
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate the OpenAPI schema for the running code version, unless it is already '
+        'cached, and store it in API_SCHEMA_CACHE_ALIAS and API_SCHEMA_FILE. Run it at deploy '
+        'or before starting the server.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild even if this version is cached.')
+        parser.add_argument('--no-file', action='store_true', help='Do not write API_SCHEMA_FILE.')
+
+    def handle(self, *args, **options):
+        if not apps.is_installed('drf_spectacular'):
+            raise CommandError('drf_spectacular is not installed; run this with the full settings.')
+        version = openapi.code_version()
+        artifacts = None
+        if not options['force']:
+            artifacts = caches[settings.API_SCHEMA_CACHE_ALIAS].get(openapi.cache_key(version))
+        if artifacts is not None:
+            self.stdout.write(f'Schema for code version {version} is already cached')
+        else:
+            started = time.perf_counter()
+            artifacts = openapi.build_artifacts()
+            openapi.store_artifacts(artifacts, version)
+            self.stdout.write(self.style.SUCCESS(
+                f'Built schema for code version {version} in {(time.perf_counter() - started) * 1000:.0f} ms: '
+                + ', '.join(f'{format} {len(a.content)} bytes ({len(a.gzipped)} gzipped)'
+                            for format, a in artifacts.items())
+            ))
+
+        if not options['no_file']:
+            path = Path(settings.API_SCHEMA_FILE)
+            content = artifacts['json' if path.suffix == '.json' else 'yaml'].content
+            if not path.exists() or path.read_bytes() != content:
+                path.write_bytes(content)
+                self.stdout.write(f'Wrote {path}')
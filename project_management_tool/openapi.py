@@ -0,0 +1,124 @@
+"""
+Prebuilt OpenAPI schema artifacts.
+
+The schema only changes with the code, so it is generated once per code
+version (``CODE_VERSION``, or a hash of the project's sources and the
+versions of the packages it is generated with) and kept, rendered and
+gzipped, in ``API_SCHEMA_CACHE_ALIAS`` and in process memory. ``manage.py
+build_schema`` fills the cache at deploy or startup; a process that finds
+no artifacts for its version builds them on the first request, and one
+without drf_spectacular (see ``settings_api``) serves ``API_SCHEMA_FILE``.
+"""
+import gzip
+import hashlib
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+
+SchemaArtifact = namedtuple('SchemaArtifact', ['content_type', 'etag', 'content', 'gzipped'])
+
+CONTENT_TYPES = {
+    'yaml': 'application/vnd.oai.openapi; charset=utf-8',
+    'json': 'application/vnd.oai.openapi+json',
+}
+# Packages whose upgrades change the generated schema.
+SCHEMA_PACKAGES = ('Django', 'djangorestframework', 'djangorestframework-simplejwt', 'drf-spectacular')
+# Rebuilt on every deploy; the timeout only lets old versions' entries go.
+CACHE_TIMEOUT = 30 * 24 * 60 * 60
+
+local_artifacts = {}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """``CODE_VERSION``, or a hash of everything the generated schema depends on."""
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+    digest = hashlib.md5()
+    for package in SCHEMA_PACKAGES:
+        try:
+            digest.update(f'{package}=={metadata.version(package)}\n'.encode())
+        except metadata.PackageNotFoundError:
+            pass
+    digest.update(repr(settings.SPECTACULAR_SETTINGS).encode())
+    base_dir = Path(settings.BASE_DIR).resolve()
+    paths = set()
+    for app_config in apps.get_app_configs():
+        app_path = Path(app_config.path).resolve()
+        if app_path.is_relative_to(base_dir):
+            paths.update(app_path.rglob('*.py'))
+    for path in sorted(paths):
+        digest.update(str(path.relative_to(base_dir)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(version):
+    return f'openapi-schema:{version}'
+
+
+def make_artifact(content, format):
+    etag = hashlib.md5(content).hexdigest()
+    return SchemaArtifact(CONTENT_TYPES[format], etag, content, gzip.compress(content, mtime=0))
+
+
+def build_artifacts():
+    """Generate the schema as drf_spectacular's ``SpectacularAPIView`` would and render each format."""
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+    return {
+        'yaml': make_artifact(OpenApiYamlRenderer().render(schema), 'yaml'),
+        'json': make_artifact(OpenApiJsonRenderer().render(schema, renderer_context={}), 'json'),
+    }
+
+
+def store_artifacts(artifacts, version=None):
+    version = version or code_version()
+    caches[settings.API_SCHEMA_CACHE_ALIAS].set(cache_key(version), artifacts, CACHE_TIMEOUT)
+    local_artifacts[version] = artifacts
+
+
+def read_schema_file(path):
+    path = Path(path)
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    format = 'json' if path.suffix == '.json' else 'yaml'
+    return {format: make_artifact(content, format)}
+
+
+def get_artifacts():
+    """
+    Return ``{format: SchemaArtifact}`` for the running code, or ``None``
+    when the schema can be neither found nor generated in this process.
+    """
+    version = code_version()
+    artifacts = local_artifacts.get(version)
+    if artifacts is not None:
+        return artifacts
+    with _lock:
+        if version in local_artifacts:
+            return local_artifacts[version]
+        artifacts = caches[settings.API_SCHEMA_CACHE_ALIAS].get(cache_key(version))
+        if artifacts is None:
+            if apps.is_installed('drf_spectacular'):
+                artifacts = build_artifacts()
+                store_artifacts(artifacts, version)
+            else:
+                # The file is built at deploy, by the same code.
+                artifacts = read_schema_file(settings.API_SCHEMA_FILE)
+                if artifacts is None:
+                    return None
+        local_artifacts[version] = artifacts
+        return artifacts
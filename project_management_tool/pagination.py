@@ -0,0 +1,236 @@
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.db import models
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over ``(-created_at, -id)``.
+
+    Cursors are opaque and carry the ``(created_at, id)`` of the boundary
+    row, so every page is a single index range scan no matter how deep the
+    client has paged. Unlike DRF's CursorPagination there is no offset
+    component: the ``id`` tiebreaker makes the position unique.
+
+    A filter backend of the view that defines ``get_ordering()`` (see
+    ``project_management_tool.filters``) may pick another datetime field
+    or direction.
+    """
+    ordering_field = 'created_at'
+    page_size = api_settings.PAGE_SIZE or 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset()`` reading the page with the async ORM API."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([obj async for obj in queryset])
+
+    def get_page_queryset(self, queryset, request, view):
+        """Return the (unevaluated) rows of the requested page plus one."""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.position_field, descending = self.get_position_field(request, view)
+        sign = '-' if descending else ''
+        self.ordering = (f'{sign}{self.position_field}', f'{sign}id')
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor[2]
+
+        if self.cursor is not None:
+            value, pk, _ = self.cursor
+            # Rows beyond the boundary in the direction being walked.
+            lookup = 'lt' if descending != reverse else 'gt'
+            queryset = queryset.filter(
+                models.Q(**{f'{self.position_field}__{lookup}': value}) |
+                models.Q(**{self.position_field: value, f'id__{lookup}': pk})
+            )
+
+        if reverse:
+            flipped = '' if descending else '-'
+            queryset = queryset.order_by(f'{flipped}{self.position_field}', f'{flipped}id')
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        # Fetch one extra row to find out whether there is a following page.
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.cursor is not None and self.cursor[2]:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def get_position_field(self, request, view):
+        """Return ``(field, descending)`` to page on."""
+        for backend in getattr(view, 'filter_backends', []):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, view)
+                if ordering:
+                    return ordering.lstrip('-'), ordering.startswith('-')
+        return self.ordering_field, True
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._boundary(self.page[-1], reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._boundary(self.page[0], reverse=True))
+
+    def _boundary(self, instance, reverse):
+        return getattr(instance, self.position_field), instance.pk, reverse
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            value = parse_datetime(tokens['p'][0])
+            pk = int(tokens['i'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk, reverse
+
+    def encode_cursor(self, cursor):
+        value, pk, reverse = cursor
+        tokens = {'p': value.isoformat(), 'i': str(pk)}
+        if reverse:
+            tokens['r'] = '1'
+
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_html_context(self):
+        return {
+            'previous_url': self.get_previous_link(),
+            'next_url': self.get_next_link(),
+        }
+
+
+class DateJoinedCursorPagination(CreatedAtCursorPagination):
+    ordering_field = 'date_joined'
+
+
+class DueDateCursorPagination(CreatedAtCursorPagination):
+    """
+    Keyset pagination over ``(due_date, priority_rank, id)``, undated rows last.
+
+    SQLite sorts NULLs first and cannot serve ``NULLS LAST`` from an index, so
+    dated and undated rows are read as two index range scans, the second one
+    only when the first runs short of a page. Pages only go forward.
+    """
+    rank_field = 'priority_rank'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        undated = queryset.filter(due_date__isnull=True)
+        dated = queryset.filter(due_date__isnull=False)
+        if self.cursor is not None:
+            due_date, rank, pk = self.cursor
+            after = (models.Q(**{f'{self.rank_field}__gt': rank}) |
+                     models.Q(**{self.rank_field: rank, 'id__gt': pk}))
+            if due_date is None:
+                dated = None
+                undated = undated.filter(after)
+            else:
+                dated = queryset.filter(
+                    models.Q(due_date__gt=due_date) | models.Q(after, due_date=due_date),
+                    due_date__gte=due_date,
+                )
+
+        # Fetch one extra row to find out whether there is a following page.
+        limit = self.page_size + 1
+        results = []
+        if dated is not None:
+            results = list(dated.order_by('due_date', self.rank_field, 'id')[:limit])
+        if len(results) < limit:
+            results += undated.order_by(self.rank_field, 'id')[:limit - len(results)]
+
+        self.page = results[:self.page_size]
+        self.has_next = len(results) > self.page_size
+        self.has_previous = False
+        return self.page
+
+    def get_next_token(self):
+        """Return the bare cursor of the following page, or ``None``."""
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        return self.encode_token((last.due_date, getattr(last, self.rank_field), last.pk))
+
+    def get_link(self, request, token):
+        if token is None:
+            return None
+        return replace_query_param(request.build_absolute_uri(), self.cursor_query_param, token)
+
+    def get_next_link(self):
+        token = self.get_next_token()
+        return None if token is None else replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def get_previous_link(self):
+        return None
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            due_date = tokens['d'][0]
+            rank = int(tokens['k'][0])
+            pk = int(tokens['i'][0])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not due_date:
+            return None, rank, pk
+        value = parse_datetime(due_date)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, rank, pk
+
+    def encode_token(self, cursor):
+        due_date, rank, pk = cursor
+        tokens = {'d': due_date.isoformat() if due_date else '', 'k': str(rank), 'i': str(pk)}
+        return b64encode(parse.urlencode(tokens).encode('ascii')).decode('ascii')
@@ -0,0 +1,34 @@
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` encoding with orjson when it is installed.
+
+    The output matches the stdlib renderer's compact form: values orjson does
+    not handle itself (and datetimes, so they keep DRF's ``Z`` suffix) go
+    through DRF's ``JSONEncoder.default``. Indented output (the browsable API,
+    ``; indent=`` in the media type) and anything orjson refuses, such as
+    integer dict keys, fall back to the stdlib renderer.
+    """
+    if orjson is not None:
+        options = orjson.OPT_PASSTHROUGH_DATETIME
+        default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.default, option=self.options)
+        except TypeError:  # orjson.JSONEncodeError
+            return super().render(data, accepted_media_type, renderer_context)
+        # Like JSONRenderer: keep the output valid JavaScript.
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
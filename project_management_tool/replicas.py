@@ -0,0 +1,79 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+# Whether ORM reads of the current request may go to a replica.
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+def _pin_key(user_id):
+    return f'db:primary-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Send ``user_id``'s reads to the primary for ``REPLICA_PIN_SECONDS``."""
+    cache.set(_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return cache.get(_pin_key(user_id), False)
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes go to the primary; reads go to a random replica while
+    ``replica_reads`` is set, which ``ReplicaReadMixin`` does for safe
+    requests. Everything else (migrations, management commands, writes'
+    own reads) stays on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and replica_reads.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Viewset mixin routing the reads of safe requests to replicas.
+
+    Reads switch over once the user is authenticated, unless the user made
+    an unsafe request within ``REPLICA_PIN_SECONDS``, so clients read their
+    own writes despite replication lag.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not settings.DATABASE_REPLICAS:
+            return
+        replica_reads.set(
+            request.method in SAFE_METHODS and
+            not (request.user.is_authenticated and is_pinned(request.user.pk))
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS and request.user.is_authenticated:
+            pin_to_primary(request.user.pk)
+        replica_reads.set(False)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # finalize_response() is skipped when an exception escapes.
+            replica_reads.set(False)
@@ -0,0 +1,184 @@
+import hashlib
+import secrets
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.response import Response
+
+from project_management_tool.invalidation import delete_now_and_on_commit
+from project_management_tool.local_cache import TTLCache
+from project_management_tool.replicas import replica_reads
+
+_MISSING = object()
+
+
+class BaseRepresentationBackend:
+    """Storage for cached representations and the version tokens they were built at."""
+
+    def get_many(self, keys):
+        """Return a dict of the ``keys`` that are present."""
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def delete_many(self, keys):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class LocalBackend(BaseRepresentationBackend):
+    """
+    In-process LRU of ``REPRESENTATION_CACHE_MAX_ENTRIES`` entries. Values are
+    shared, not copied, so a hit costs no unpickling. Invalidations only reach
+    the process they happen in, so only use it when a single process serves
+    the API.
+    """
+
+    def __init__(self):
+        self._cache = TTLCache(settings.REPRESENTATION_CACHE_MAX_ENTRIES, settings.REPRESENTATION_CACHE_TIMEOUT)
+
+    def get_many(self, keys):
+        values = {key: self._cache.get(key, _MISSING) for key in keys}
+        return {key: value for key, value in values.items() if value is not _MISSING}
+
+    def set(self, key, value):
+        self._cache.set(key, value)
+
+    def delete_many(self, keys):
+        for key in keys:
+            self._cache.delete(key)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class DjangoCacheBackend(BaseRepresentationBackend):
+    """
+    Stores entries in the ``REPRESENTATION_CACHE_ALIAS`` cache, which bounds
+    and evicts them itself; with a shared cache (e.g. Redis) invalidations
+    reach every process.
+    """
+    key_prefix = 'representation:'
+
+    def __init__(self):
+        self._cache = caches[settings.REPRESENTATION_CACHE_ALIAS]
+
+    def get_many(self, keys):
+        values = self._cache.get_many([self.key_prefix + key for key in keys])
+        return {key[len(self.key_prefix):]: value for key, value in values.items()}
+
+    def set(self, key, value):
+        self._cache.set(self.key_prefix + key, value, settings.REPRESENTATION_CACHE_TIMEOUT)
+
+    def delete_many(self, keys):
+        self._cache.delete_many([self.key_prefix + key for key in keys])
+
+    def clear(self):
+        # Clears the whole alias; give the representations their own when it is shared.
+        self._cache.clear()
+
+
+@lru_cache(maxsize=None)
+def get_representation_cache():
+    """Return the ``REPRESENTATION_CACHE_BACKEND`` backend, or ``None`` when caching is disabled."""
+    if not settings.REPRESENTATION_CACHE_BACKEND:
+        return None
+    return import_string(settings.REPRESENTATION_CACHE_BACKEND)()
+
+
+def _version_key(label, pk):
+    return f'version:{label}:{pk}'
+
+
+def get_versions(objects):
+    """
+    Return the current version token of each ``(label, pk)`` in ``objects``,
+    keyed like the entries' ``versions``. Objects without a token get a new
+    one, so a dropped token can never match an entry built before.
+    """
+    backend = get_representation_cache()
+    keys = [_version_key(label, pk) for label, pk in objects]
+    versions = backend.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = secrets.token_hex(8)
+            backend.set(key, versions[key])
+    return versions
+
+
+def invalidate_representations(*objects):
+    """Drop the version tokens of the given ``(label, pk)`` pairs, and every representation built on them."""
+    backend = get_representation_cache()
+    if backend is None:
+        return
+    keys = [_version_key(label, pk) for label, pk in set(objects) if pk is not None]
+    delete_now_and_on_commit(backend.delete_many, keys)
+
+
+def represented_fields_changed(serializer_class, update_fields):
+    """Whether a save with ``update_fields`` may change what ``serializer_class`` renders."""
+    return update_fields is None or not set(update_fields).isdisjoint(serializer_class.Meta.fields)
+
+
+class CachedRetrieveMixin:
+    """
+    Viewset mixin serving ``retrieve`` from the representation cache.
+
+    Entries are keyed by ``representation_label``, the object id and the
+    ``?fields=``/``?expand=`` variant, and record the version tokens of the
+    object and of ``get_representation_dependencies(instance)``. A hit is only
+    served while all of them are unchanged, i.e. no signal handler called
+    ``invalidate_representations`` for them since, and while
+    ``representation_visible(scope)`` allows the user to see an object of
+    ``get_representation_scope(instance)``; otherwise the action runs as usual.
+    Without a ``REPRESENTATION_CACHE_BACKEND`` it always runs.
+    """
+    representation_label = None
+
+    def get_representation_dependencies(self, instance):
+        return []
+
+    def get_representation_scope(self, instance):
+        raise NotImplementedError
+
+    def representation_visible(self, scope):
+        raise NotImplementedError
+
+    def get_representation_key(self, pk):
+        params = self.request.query_params
+        variant = hashlib.md5(f"{params.get('fields', '')}|{params.get('expand', '')}".encode()).hexdigest()[:16]
+        return f'{self.representation_label}:{pk}:{variant}'
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            pk = int(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (KeyError, TypeError, ValueError):
+            return super().retrieve(request, *args, **kwargs)
+        backend = get_representation_cache()
+        if backend is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        key = self.get_representation_key(pk)
+        entry = backend.get_many([key]).get(key)
+        if entry is not None and self.representation_visible(entry['scope']):
+            if backend.get_many(entry['versions']) == entry['versions']:
+                return Response(entry['data'])
+
+        # Every token is read before the rows it covers, so a concurrent
+        # write either changes the data read or the token recorded. The rows
+        # come from the primary, a lagging replica would stay cached.
+        versions = get_versions([(self.representation_label, pk)])
+        token = replica_reads.set(False)
+        try:
+            instance = self.get_object()
+            versions.update(get_versions(self.get_representation_dependencies(instance)))
+            data = self.get_serializer(instance).data
+        finally:
+            replica_reads.reset(token)
+        backend.set(key, {'scope': self.get_representation_scope(instance), 'versions': versions, 'data': data})
+        return Response(data)
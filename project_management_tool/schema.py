@@ -0,0 +1,9 @@
+"""
+drf-spectacular extensions; imported by the app config when drf_spectacular is
+installed, so API workers without it never load the schema generator.
+"""
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = 'project_management_tool.authentication.ClaimsJWTAuthentication'
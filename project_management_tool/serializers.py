@@ -56,7 +56,53 @@ class UserLoginSerializer(serializers.Serializer):
         return attrs
 
 
-class UserSerializer(serializers.ModelSerializer):
+def _split_paths(paths):
+    """Turn ``['task.project', 'user']`` into ``{'task': ['project'], 'user': []}``."""
+    tree = {}
+    for path in paths:
+        head, _, rest = path.partition('.')
+        children = tree.setdefault(head, [])
+        if rest:
+            children.append(rest)
+    return tree
+
+
+class ExpandableFieldsMixin:
+    """
+    Lets clients shape the representation with ``?fields=`` and ``?expand=``.
+
+    Relations are rendered as primary keys by default. ``expandable_fields``
+    maps a field name to ``(serializer_class, kwargs)`` used instead when the
+    field is expanded; dotted paths (``?expand=task.project``) expand nested
+    serializers too. ``fields``/``expand`` may also be passed as keyword
+    arguments, which takes precedence over the request query parameters.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if request is not None:
+            if fields is None and request.query_params.get('fields'):
+                fields = request.query_params['fields'].split(',')
+            if expand is None and request.query_params.get('expand'):
+                expand = request.query_params['expand'].split(',')
+
+        for name, children in _split_paths(expand or []).items():
+            if name not in self.expandable_fields or name not in self.fields:
+                continue
+            serializer_class, options = self.expandable_fields[name]
+            self.fields[name] = serializer_class(expand=children, **options)
+
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class UserSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'date_joined']
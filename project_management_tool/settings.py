@@ -11,8 +11,13 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
+from project_management_tool.db import SQLITE_PRAGMAS
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -52,6 +57,8 @@ custom_apps = [
     "projects",
     "task",
     "comments",
+    "search",
+    "project_management_tool",
 ]
 
 INSTALLED_APPS = default_apps + third_party_apps + custom_apps
@@ -65,9 +72,27 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'project_management_tool.middleware.AsgiUrlconfMiddleware',
 ]
 
+# Pure-API deployments: JWT requests never use sessions, messages or CSRF
+# cookies (DRF views are CSRF-exempt and authenticate themselves), so skip
+# that middleware and the admin, which needs it.
+API_ONLY = os.environ.get('API_ONLY', 'False').lower() == 'true'
+if API_ONLY:
+    INSTALLED_APPS.remove('django.contrib.admin')
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE if middleware not in (
+            'django.contrib.sessions.middleware.SessionMiddleware',
+            'django.middleware.csrf.CsrfViewMiddleware',
+            'django.contrib.auth.middleware.AuthenticationMiddleware',
+            'django.contrib.messages.middleware.MessageMiddleware',
+        )
+    ]
+
 ROOT_URLCONF = 'project_management_tool.urls'
+# Used for requests served through asgi.py; routes the hot reads to async views.
+ASGI_ROOT_URLCONF = 'project_management_tool.asgi_urls'
 
 TEMPLATES = [
     {
@@ -91,12 +116,125 @@ WSGI_APPLICATION = 'project_management_tool.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE picks 'sqlite' (default) or 'postgresql'. Connections are kept open
+# for DB_CONN_MAX_AGE seconds and health-checked before reuse.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'project_management_tool'),
+            'USER': os.environ.get('DB_USER', ''),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', ''),
+            'PORT': os.environ.get('DB_PORT', ''),
+            'OPTIONS': {
+                'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5)),
+            },
+            # Required behind a transaction-pooling PgBouncer.
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_DISABLE_SERVER_SIDE_CURSORS', 'False').lower() == 'true',
+        }
+    }
+elif DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            # Applied to each new connection by project_management_tool.db.
+            'PRAGMAS': SQLITE_PRAGMAS if os.environ.get('SQLITE_TUNING', 'True').lower() == 'true' else {},
+        }
+    }
+else:
+    raise ValueError(f"Unsupported DB_ENGINE {DB_ENGINE!r}; use 'sqlite' or 'postgresql'")
+
+DATABASES['default'].update({
+    'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+    'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
+})
+
+# Read replicas: DB_REPLICAS is a comma-separated list of hosts (host[:port],
+# PostgreSQL) or files (SQLite) holding copies of the primary. Safe requests
+# read from them unless the user wrote within REPLICA_PIN_SECONDS
+# (see project_management_tool.replicas).
+DATABASE_REPLICAS = []
+for index, location in enumerate(filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    replica = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    if DB_ENGINE == 'postgresql':
+        host, _, port = location.partition(':')
+        replica.update(HOST=host, PORT=port or replica['PORT'])
+    else:
+        replica['NAME'] = location
+    DATABASES[f'replica_{index}'] = replica
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['project_management_tool.replicas.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# CACHE_URL selects a cache shared by all processes: redis://host:6379/0 (needs the
+# redis package) or memcached://host:11211 (needs pymemcache). Unset, each process
+# has its own LocMemCache. The signal handlers that invalidate cached entries only
+# reach their own process's LocMemCache, so deployments with more than one worker
+# process must set CACHE_URL; without it, the timeouts below default to a few
+# seconds to bound how long other processes serve stale entries.
+CACHE_URL = os.environ.get('CACHE_URL', '')
+if CACHE_URL.startswith(('redis://', 'rediss://', 'unix://')):
+    _default_cache = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    }
+elif CACHE_URL.startswith('memcached://'):
+    _default_cache = {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': CACHE_URL.removeprefix('memcached://'),
+    }
+elif not CACHE_URL:
+    _default_cache = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'project-management-tool',
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000)),
+        },
     }
+else:
+    raise ImproperlyConfigured(
+        f'Unsupported CACHE_URL {CACHE_URL!r}; use redis://, rediss://, unix:// or memcached://'
+    )
+CACHES = {'default': _default_cache}
+_cache_timeout = 300 if CACHE_URL else 5
+
+# Seconds a user's accessible project ids stay cached (see projects.access)
+PROJECT_ACCESS_CACHE_TIMEOUT = int(os.environ.get('PROJECT_ACCESS_CACHE_TIMEOUT', _cache_timeout))
+
+# Seconds the first page of a user's "my work" feed stays cached (see task.feed)
+MY_WORK_CACHE_TIMEOUT = int(os.environ.get('MY_WORK_CACHE_TIMEOUT', _cache_timeout))
+
+
+# Password hashing. PASSWORD_HASHER picks the hasher for new passwords: 'scrypt'
+# (memory-hard, the default), 'argon2' (needs argon2-cffi) or 'pbkdf2'. The others
+# stay listed to verify existing hashes, which Django rehashes with the preferred
+# hasher and parameters on the next successful login.
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'scrypt')
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.environ.get('PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 14))
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 600_000))
+_password_hashers = {
+    'scrypt': 'project_management_tool.hashers.TunedScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'pbkdf2': 'project_management_tool.hashers.TunedPBKDF2PasswordHasher',
 }
+if PASSWORD_HASHER not in _password_hashers:
+    raise ImproperlyConfigured(f'Unsupported PASSWORD_HASHER {PASSWORD_HASHER!r}; use scrypt, argon2 or pbkdf2')
+if PASSWORD_HASHER == 'argon2' and find_spec('argon2') is None:
+    raise ImproperlyConfigured("PASSWORD_HASHER 'argon2' requires the argon2-cffi package")
+PASSWORD_HASHERS = [
+    _password_hashers.pop(PASSWORD_HASHER),
+    *_password_hashers.values(),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
 
 
 # Password validation
@@ -143,12 +281,45 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'project_management_tool.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson-backed when installed, the stdlib json module otherwise.
+    'DEFAULT_RENDERER_CLASSES': [
+        'project_management_tool.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'project_management_tool.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Token buckets (see project_management_tool.throttling); '10/min' allows a burst
+    # of 10 and then one request every 6 seconds. Scopes without a rate are not limited.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'project_management_tool.throttling.AnonTokenBucketThrottle',
+        'project_management_tool.throttling.UserTokenBucketThrottle',
+        'project_management_tool.throttling.WriteTokenBucketThrottle',
+        'project_management_tool.throttling.ScopedTokenBucketThrottle',
+        'project_management_tool.throttling.LoginUsernameThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': os.environ.get('THROTTLE_ANON_RATE', '120/min'),
+        'user': os.environ.get('THROTTLE_USER_RATE', '1200/min'),
+        'write': os.environ.get('THROTTLE_WRITE_RATE', '300/min'),
+        'login': os.environ.get('THROTTLE_LOGIN_RATE', '10/min'),
+        'login_username': os.environ.get('THROTTLE_LOGIN_USERNAME_RATE', '5/min'),
+        'register': os.environ.get('THROTTLE_REGISTER_RATE', '5/hour'),
+    },
+    # Reverse proxies in front of the app. Throttles identify clients by REMOTE_ADDR when
+    # 0, or by the address that many hops from the end of X-Forwarded-For; never trust
+    # the whole header, which clients can set to anything to get a fresh bucket.
+    'NUM_PROXIES': int(os.environ.get('THROTTLE_NUM_PROXIES', 0)),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'project_management_tool.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 50)),
 }
 
 # JWT Configuration
@@ -158,13 +329,62 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# In-process cache of the user state ClaimsJWTAuthentication checks tokens
+# against: how long an entry lives (seconds) and how many users are kept.
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get('AUTH_USER_CACHE_TIMEOUT', 30))
+AUTH_USER_CACHE_SIZE = int(os.environ.get('AUTH_USER_CACHE_SIZE', 4096))
+
+# Cache holding the throttles' token buckets; None keeps them per process. The
+# in-process store (also the fallback when the cache fails) holds this many buckets.
+THROTTLE_CACHE_ALIAS = os.environ.get('THROTTLE_CACHE_ALIAS', 'default') or None
+THROTTLE_LOCAL_MAX_ENTRIES = int(os.environ.get('THROTTLE_LOCAL_MAX_ENTRIES', 100_000))
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
     "http://127.0.0.1:3000",
 ]
 
+# Search backend (dotted path to a search.backends.BaseSearchBackend subclass).
+# None picks SQLite FTS5 on SQLite and the portable inverted index elsewhere.
+SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND') or None
+
+# Delta sync (see projects.sync): changes returned per response, and days tombstones
+# are kept. Older sync tokens get a 410 and the client has to resync in full;
+# the prune_tombstones command deletes the expired tombstones.
+SYNC_PAGE_SIZE = int(os.environ.get('SYNC_PAGE_SIZE', 1000))
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+# Cache of serialized project and task details (see project_management_tool.representations).
+# The backend is a dotted path to a BaseRepresentationBackend subclass; None disables
+# the cache. Every process must see every invalidation, so it defaults to
+# DjangoCacheBackend (entries in REPRESENTATION_CACHE_ALIAS) when CACHE_URL sets up a
+# shared cache, and is off otherwise. The in-process LocalBackend is an opt-in for
+# single-process deployments.
+REPRESENTATION_CACHE_BACKEND = os.environ.get(
+    'REPRESENTATION_CACHE_BACKEND',
+    'project_management_tool.representations.DjangoCacheBackend' if CACHE_URL else '',
+) or None
+REPRESENTATION_CACHE_ALIAS = os.environ.get('REPRESENTATION_CACHE_ALIAS', 'default')
+REPRESENTATION_CACHE_TIMEOUT = int(os.environ.get('REPRESENTATION_CACHE_TIMEOUT', 300))
+REPRESENTATION_CACHE_MAX_ENTRIES = int(os.environ.get('REPRESENTATION_CACHE_MAX_ENTRIES', 10000))
+
+# Project event streams (see projects.events): seconds between keep-alive comments,
+# seconds before a stream ends and the client reconnects, and how many undelivered
+# events a stream may queue before it is ended.
+PROJECT_EVENTS_KEEPALIVE = int(os.environ.get('PROJECT_EVENTS_KEEPALIVE', 15))
+PROJECT_EVENTS_MAX_AGE = int(os.environ.get('PROJECT_EVENTS_MAX_AGE', 300))
+PROJECT_EVENTS_QUEUE_SIZE = int(os.environ.get('PROJECT_EVENTS_QUEUE_SIZE', 1000))
+
 # API Documentation
+# The schema is built once per CODE_VERSION (default: a hash of the project's source)
+# by `manage.py build_schema` and kept in API_SCHEMA_CACHE_ALIAS; see
+# project_management_tool.openapi. API_SCHEMA_FILE is the copy `build_schema` writes
+# for API workers without drf_spectacular (see settings_api) or a shared cache.
+CODE_VERSION = os.environ.get('CODE_VERSION') or None
+API_SCHEMA_CACHE_ALIAS = os.environ.get('API_SCHEMA_CACHE_ALIAS', 'default')
+API_SCHEMA_FILE = Path(os.environ.get('API_SCHEMA_FILE', BASE_DIR / 'schema.yml'))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Project Management API',
     'DESCRIPTION': 'API for managing users, projects, tasks, and comments',
@@ -0,0 +1,36 @@
+"""
+Settings for API worker processes:
+``DJANGO_SETTINGS_MODULE=project_management_tool.settings_api``.
+
+Loads only what the REST API needs on top of ``settings``: no admin,
+sessions, messages, static files or drf_spectacular (the schema is served
+as built by ``build_schema``, see ``project_management_tool.openapi``),
+JSON-only responses, and four middlewares. Run migrations, ``collectstatic``,
+the docs pages and ``build_schema`` with the full settings.
+"""
+from project_management_tool.settings import *  # noqa: F401,F403
+from project_management_tool.settings import INSTALLED_APPS, REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS if app not in (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+        'drf_spectacular',
+    )
+]
+
+MIDDLEWARE = [
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'project_management_tool.middleware.AsgiUrlconfMiddleware',
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    # No browsable API: its templates and forms are for people, not API clients.
+    'DEFAULT_RENDERER_CLASSES': ['project_management_tool.renderers.FastJSONRenderer'],
+    'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.openapi.AutoSchema',
+}
@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from projects.models import Project, ProjectMember
+
+
+class ProjectFixtureMixin:
+    """
+    APITestCase fixture: an empty cache and ``self.user`` ('owner'),
+    authenticated on ``self.client``, who owns ``self.project`` and is its
+    Admin member.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name='Project', description='', owner=self.user)
+        ProjectMember.objects.create(project=self.project, user=self.user, role='Admin')
@@ -0,0 +1,364 @@
+import gzip
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from importlib.util import find_spec
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.drainage import GENERATOR_STATS
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from project_management_tool import openapi
+from project_management_tool.authentication import (
+    ClaimsJWTAuthentication, ClaimsRefreshToken, user_states,
+)
+from project_management_tool.parsers import FastJSONParser
+from project_management_tool.renderers import FastJSONRenderer
+from project_management_tool.testing import ProjectFixtureMixin
+from project_management_tool.throttling import TokenBucketThrottle, UserTokenBucketThrottle, local_buckets
+from project_management_tool.replicas import PrimaryReplicaRouter, replica_reads
+
+
+class ClaimsJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_states.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123', email='owner@example.com')
+        self.url = reverse('project-list')
+
+    def authorize(self, token_class=ClaimsRefreshToken):
+        token = token_class.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return token
+
+    def test_user_is_rebuilt_from_claims(self):
+        self.authorize()
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        # user state and (empty) access ids are cached
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_other_fields_load_lazily(self):
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        user = ClaimsJWTAuthentication().get_user(token)
+        with self.assertNumQueries(0):
+            self.assertEqual((user.pk, user.username, user.is_staff), (self.user.pk, 'owner', False))
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, 'owner@example.com')
+
+    def test_deactivated_user_is_rejected(self):
+        self.authorize()
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_changed_privileges_revoke_token(self):
+        self.authorize()
+        self.client.get(self.url)
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_tokens_without_claims_fall_back_to_lookup(self):
+        self.authorize(RefreshToken)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_login_issues_claims(self):
+        response = self.client.post(reverse('user-login'), {'username': 'owner', 'password': 'testpass123'})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+
+class SQLitePragmaTests(TestCase):
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite only')
+    def test_connections_are_tuned(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_x'])
+class ReplicaRoutingTests(ProjectFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('project-list')
+
+    def test_router(self):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(User), DEFAULT_DB_ALIAS)
+        token = replica_reads.set(True)
+        try:
+            self.assertEqual(router.db_for_read(User), 'replica_x')
+            self.assertEqual(router.db_for_write(User), DEFAULT_DB_ALIAS)
+        finally:
+            replica_reads.reset(token)
+
+    def reads(self, method, *args, **kwargs):
+        """Send a request and return whether each of its reads was offered to a replica."""
+        seen = []
+
+        def db_for_read(router, model, **hints):
+            seen.append(replica_reads.get())
+            return DEFAULT_DB_ALIAS
+
+        with mock.patch.object(PrimaryReplicaRouter, 'db_for_read', db_for_read):
+            response = getattr(self.client, method)(*args, **kwargs)
+        self.assertLess(response.status_code, 400)
+        self.assertFalse(replica_reads.get())
+        return seen
+
+    def test_safe_requests_read_from_replicas(self):
+        self.assertIn(True, self.reads('get', self.url))
+
+    def test_writer_reads_from_primary(self):
+        self.reads('post', self.url, {'name': 'Apollo', 'description': 'Moon'})
+        self.assertNotIn(True, self.reads('get', self.url))
+
+
+class FastJSONTests(TestCase):
+    data = {
+        'results': [{'id': 1, 'title': 'Caf\u00e9 \u2028', 'done': False, 'due_date': None}],
+        'created_at': timezone.now(),
+        'estimate': timedelta(hours=2),
+        'budget': Decimal('1.50'),
+        'detail': _('Not found.'),
+    }
+
+    def test_renders_like_stdlib(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_falls_back_for_what_orjson_refuses(self):
+        self.assertEqual(FastJSONRenderer().render({1: 'a'}), b'{"1":"a"}')
+        indented = FastJSONRenderer().render(self.data, 'application/json; indent=2')
+        self.assertEqual(indented, JSONRenderer().render(self.data, 'application/json; indent=2'))
+
+    def test_without_orjson(self):
+        with mock.patch('project_management_tool.renderers.orjson', None), \
+                mock.patch('project_management_tool.parsers.orjson', None):
+            encoded = FastJSONRenderer().render(self.data)
+            self.assertEqual(encoded, JSONRenderer().render(self.data))
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(b'{"a": [1]}')), {'a': [1]})
+
+    def test_parser(self):
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"title": "Caf\u00e9"}'.encode())), {'title': 'Caf\u00e9'})
+        for body in (b'{"a": NaN}', b'{"a": ', b'\xff'):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(body))
+
+
+class TokenBucketThrottleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        local_buckets.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+
+    def rates(self, **rates):
+        return mock.patch.object(TokenBucketThrottle, 'THROTTLE_RATES', rates)
+
+    def login(self, username='owner', ip='10.0.0.1', **extra):
+        return self.client.post(reverse('user-login'), {'username': username, 'password': 'wrong'},
+                                REMOTE_ADDR=ip, **extra)
+
+    def test_login_is_limited_per_address(self):
+        with self.rates(login='3/min'):
+            self.assertEqual([self.login().status_code for _ in range(3)], [400] * 3)
+            response = self.login()
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response)
+            self.assertEqual(self.login(ip='10.0.0.2').status_code, 400)
+
+    def test_forwarded_for_does_not_reset_the_limit(self):
+        with self.rates(login='2/min'):
+            statuses = [self.login(HTTP_X_FORWARDED_FOR=address).status_code
+                        for address in ('1.1.1.1', '2.2.2.2', '3.3.3.3')]
+        self.assertEqual(statuses, [400, 400, 429])
+
+    def test_login_is_limited_per_username(self):
+        with self.rates(login_username='2/min'):
+            self.assertEqual(self.login(ip='10.0.0.1').status_code, 400)
+            self.assertEqual(self.login(ip='10.0.0.2').status_code, 400)
+            self.assertEqual(self.login(ip='10.0.0.3').status_code, 429)
+            self.assertEqual(self.login(username='other', ip='10.0.0.3').status_code, 400)
+
+    def test_login_with_non_object_body(self):
+        with self.rates(login_username='2/min'):
+            response = self.client.post(reverse('user-login'), [1, 2], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_only_writes_count_against_write_scope(self):
+        self.client.force_authenticate(self.user)
+        url = reverse('project-list')
+        with self.rates(write='2/min'):
+            for _ in range(2):
+                self.assertEqual(self.client.post(url, {'name': 'P', 'description': 'D'}).status_code, 201)
+            self.assertEqual(self.client.post(url, {'name': 'P', 'description': 'D'}).status_code, 429)
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def allow(self, throttle, now):
+        throttle.timer = lambda: now
+        request = mock.Mock(user=self.user)
+        return throttle.allow_request(request, None)
+
+    def test_bucket_refills_over_time(self):
+        with self.rates(user='2/min'):
+            throttle = UserTokenBucketThrottle()
+            self.assertEqual([self.allow(throttle, 1000.0) for _ in range(3)], [True, True, False])
+            self.assertAlmostEqual(throttle.wait(), 30.0)
+            self.assertFalse(self.allow(throttle, 1029.0))
+            self.assertTrue(self.allow(throttle, 1030.0))
+            # Idle for long enough, the whole burst is available again.
+            self.assertEqual([self.allow(throttle, 2000.0) for _ in range(3)], [True, True, False])
+
+    def test_falls_back_to_local_buckets(self):
+        with self.rates(user='1/min'), mock.patch.object(type(caches['default']), 'incr', side_effect=ConnectionError), \
+                self.assertLogs('project_management_tool.throttling', 'WARNING'):
+            throttle = UserTokenBucketThrottle()
+            self.assertTrue(self.allow(throttle, 1000.0))
+            self.assertFalse(self.allow(throttle, 1000.0))
+
+
+class PasswordHasherTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+
+    def login(self):
+        response = self.client.post(reverse('user-login'), {'username': 'owner', 'password': 'testpass123'})
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        return self.user.password
+
+    def test_new_passwords_use_scrypt(self):
+        self.assertTrue(self.user.password.startswith('scrypt$16384$'))
+
+    def test_login_upgrades_other_hashers(self):
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password('testpass123', hasher='pbkdf2_sha256')
+        )
+        self.assertTrue(self.login().startswith('scrypt$'))
+
+    def test_login_applies_new_work_factor(self):
+        with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2 ** 12):
+            self.assertTrue(self.login().startswith('scrypt$4096$'))
+
+
+class PasswordHasherSettingTests(TestCase):
+    def load_settings(self, hasher):
+        env = {**os.environ, 'PASSWORD_HASHER': hasher}
+        return subprocess.run([sys.executable, '-c', 'import django; django.setup()'], cwd=settings.BASE_DIR,
+                              env=env, capture_output=True, text=True)
+
+    def test_unknown_hasher(self):
+        result = self.load_settings('bcrypt')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("Unsupported PASSWORD_HASHER 'bcrypt'; use scrypt, argon2 or pbkdf2", result.stderr)
+
+    @skipUnless(find_spec('argon2') is None, 'argon2-cffi is installed')
+    def test_argon2_without_argon2_cffi(self):
+        result = self.load_settings('argon2')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('requires the argon2-cffi package', result.stderr)
+
+
+class APISettingsTests(TestCase):
+    def test_api_profile_loads_without_schema_generator(self):
+        script = (
+            'import sys, django; django.setup()\n'
+            'from django.core.management import call_command; call_command("check")\n'
+            'from django.urls import get_resolver, reverse; get_resolver()._populate()\n'
+            'assert "drf_spectacular" not in sys.modules, "drf_spectacular imported"\n'
+            'assert reverse("schema") == "/api/schema/"\n'
+        )
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'project_management_tool.settings_api'}
+        result = subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class SchemaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        openapi.local_artifacts.clear()
+        openapi.code_version.cache_clear()
+        self.addCleanup(openapi.code_version.cache_clear)
+        self.enterContext(GENERATOR_STATS.silence())
+        self.url = reverse('schema')
+
+    def test_built_once_per_code_version(self):
+        with mock.patch.object(openapi, 'build_artifacts', wraps=openapi.build_artifacts) as build:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url)
+            self.assertEqual(build.call_count, 1)
+            # Other workers sharing the cache do not build it again.
+            openapi.local_artifacts.clear()
+            self.assertEqual(self.client.get(self.url).content, first.content)
+            self.assertEqual(build.call_count, 1)
+
+            with override_settings(CODE_VERSION='next'):
+                openapi.code_version.cache_clear()
+                self.client.get(self.url)
+            self.assertEqual(build.call_count, 2)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Content-Type'], 'application/vnd.oai.openapi; charset=utf-8')
+        self.assertTrue(first.content.startswith(b'openapi: 3.0.3\n'))
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+    def test_formats_and_gzip(self):
+        plain = self.client.get(self.url, {'format': 'json'})
+        self.assertEqual(plain['Content-Type'], 'application/vnd.oai.openapi+json')
+        self.assertEqual(self.client.get(self.url, HTTP_ACCEPT='application/json').content, plain.content)
+
+        compressed = self.client.get(self.url, {'format': 'json'}, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertNotEqual(compressed['ETag'], plain['ETag'])
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+
+    def test_build_schema_command(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(API_SCHEMA_FILE=Path(directory) / 'schema.yml'):
+            out = io.StringIO()
+            call_command('build_schema', stdout=out)
+            self.assertIn('Built schema', out.getvalue())
+            content = (Path(directory) / 'schema.yml').read_bytes()
+            call_command('build_schema', stdout=out)
+            self.assertIn('already cached', out.getvalue())
+
+        with mock.patch.object(openapi, 'build_artifacts') as build:
+            response = self.client.get(self.url)
+        build.assert_not_called()
+        self.assertEqual(response.content, content)
+
+    def test_serves_file_without_drf_spectacular(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(API_SCHEMA_FILE=Path(directory) / 'schema.yml'), \
+                mock.patch.object(openapi.apps, 'is_installed', return_value=False):
+            self.assertEqual(self.client.get(self.url).status_code, 404)
+            (Path(directory) / 'schema.yml').write_bytes(b'openapi: 3.0.3\n')
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'openapi: 3.0.3\n')
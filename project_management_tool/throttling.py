@@ -0,0 +1,202 @@
+"""
+Token-bucket throttles.
+
+A bucket of ``num_requests`` tokens refills at ``num_requests / duration``
+(``'10/min'``: a burst of 10, then one every 6 seconds). Buckets are kept as
+a GCRA "theoretical arrival time" in microseconds, so an allowed request
+costs one atomic ``incr`` on ``THROTTLE_CACHE_ALIAS`` instead of DRF's
+read-modify-write of a request history list. When that cache fails, or
+``THROTTLE_CACHE_ALIAS`` is ``None``, buckets live in process memory instead.
+"""
+import hashlib
+import logging
+import threading
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import SimpleRateThrottle
+
+from project_management_tool.local_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Longest throttle period ('/day') twice over, like the shared-cache timeouts below.
+LOCAL_BUCKET_TIMEOUT = 2 * 24 * 60 * 60
+
+
+class LocalBuckets:
+    """In-process bucket store with the subset of the cache API the throttles use."""
+
+    def __init__(self):
+        self._buckets = TTLCache(settings.THROTTLE_LOCAL_MAX_ENTRIES, LOCAL_BUCKET_TIMEOUT)
+        self._lock = threading.Lock()
+
+    def add(self, key, value, timeout):
+        with self._lock:
+            if self._buckets.get(key) is not None:
+                return False
+            self._buckets.set(key, value)
+            return True
+
+    def incr(self, key, delta):
+        with self._lock:
+            value = self._buckets.get(key)
+            if value is None:
+                raise ValueError(f"Key '{key}' not found")
+            self._buckets.set(key, value + delta)
+            return value + delta
+
+    def decr(self, key, delta):
+        return self.incr(key, -delta)
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._buckets.set(key, value)
+
+    def touch(self, key, timeout):
+        pass
+
+    def clear(self):
+        self._buckets.clear()
+
+
+local_buckets = LocalBuckets()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    cache_format = 'throttle:bucket:%(scope)s:%(ident)s'
+
+    def __init__(self):
+        super().__init__()
+        if self.rate is not None:
+            # Microseconds between tokens, and how far ahead of now the schedule may run.
+            self.interval = max(self.duration * 1_000_000 // self.num_requests, 1)
+            self.tolerance = self.interval * self.num_requests
+
+    def get_rate(self):
+        # Scopes without a configured rate are not throttled.
+        return self.THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = int(self.timer() * 1_000_000)
+        alias = settings.THROTTLE_CACHE_ALIAS
+        if alias is not None:
+            try:
+                self._wait = self.consume(caches[alias])
+                return self._wait == 0
+            except Exception:  # the cache is down; fall back rather than fail every request
+                logger.warning('Throttle cache %r failed, using in-process buckets', alias, exc_info=True)
+        self._wait = self.consume(local_buckets)
+        return self._wait == 0
+
+    def consume(self, store):
+        """Take a token from the bucket at ``self.key``; return 0 or the seconds until one is available."""
+        timeout = self.duration * 2
+        try:
+            tat = store.incr(self.key, self.interval)
+        except ValueError:
+            if store.add(self.key, self.now + self.interval, timeout):
+                return 0
+            tat = store.incr(self.key, self.interval)
+
+        if tat - self.interval < self.now:
+            # The bucket refilled while idle; concurrent resets may let a few extra requests through.
+            tat = self.now + self.interval
+            store.set(self.key, tat, timeout)
+        elif tat - self.now > self.tolerance // 2:
+            # incr() keeps the expiry it was added with; a busy bucket must not expire into a full one.
+            store.touch(self.key, timeout)
+
+        if tat <= self.now + self.tolerance:
+            return 0
+        store.decr(self.key, self.interval)
+        return (tat - self.tolerance - self.now) / 1_000_000
+
+    def wait(self):
+        return self._wait
+
+
+class AnonTokenBucketThrottle(TokenBucketThrottle):
+    """Limits anonymous requests per IP address."""
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Limits authenticated requests per user."""
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': request.user.pk}
+
+
+class WriteTokenBucketThrottle(TokenBucketThrottle):
+    """Limits unsafe requests per user, or per IP address for anonymous ones."""
+    scope = 'write'
+
+    def get_cache_key(self, request, view):
+        if request.method in SAFE_METHODS:
+            return None
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class ScopedTokenBucketThrottle(TokenBucketThrottle):
+    """Limits views with a ``throttle_scope`` per user, or per IP address for anonymous requests."""
+
+    def __init__(self):
+        # The rate depends on the view; see allow_request().
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, 'throttle_scope', None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        super().__init__()
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    """
+    Limits login attempts per submitted username, which also holds when the
+    attempts come from many addresses. Only applies to the ``login`` scope.
+    """
+    scope = 'login_username'
+
+    def get_cache_key(self, request, view):
+        if getattr(view, 'throttle_scope', None) != 'login':
+            return None
+        if not isinstance(request.data, Mapping):
+            # A JSON array or scalar body; the serializer rejects it.
+            return None
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            return None
+        # Hashed: usernames may hold characters cache keys must not.
+        ident = hashlib.md5(username.lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
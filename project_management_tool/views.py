@@ -1,22 +1,34 @@
+import re
+
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from django.views import View
 from rest_framework import generics, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
+from .authentication import ClaimsRefreshToken
+from .openapi import get_artifacts
+from .pagination import DateJoinedCursorPagination
+from .replicas import ReplicaReadMixin
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserSerializer
 
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
 
 class UserRegistrationView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
     permission_classes = [AllowAny]
+    throttle_scope = 'register'
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         return Response({
             'user': UserSerializer(user).data,
             'refresh': str(refresh),
@@ -27,13 +39,15 @@ class UserRegistrationView(generics.CreateAPIView):
 class UserLoginView(generics.GenericAPIView):
     serializer_class = UserLoginSerializer
     permission_classes = [AllowAny]
+    # Each attempt hashes a password; see LoginUsernameThrottle too.
+    throttle_scope = 'login'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
 
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         return Response({
             'user': UserSerializer(user).data,
             'refresh': str(refresh),
@@ -41,10 +55,11 @@ class UserLoginView(generics.GenericAPIView):
         })
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = DateJoinedCursorPagination
 
     def get_permissions(self):
         if self.action in ['create']:
@@ -71,3 +86,35 @@ class UserViewSet(viewsets.ModelViewSet):
             if obj != self.request.user and not self.request.user.is_staff:
                 self.permission_denied(self.request)
         return obj
+
+
+class SchemaView(View):
+    """
+    Serves the OpenAPI schema from the prebuilt artifacts in
+    ``project_management_tool.openapi``, gzipped when the client accepts it
+    and with an ETag, instead of generating it per request. YAML by default;
+    JSON for ``?format=json`` or an ``Accept`` asking for JSON.
+    """
+
+    def get(self, request):
+        artifacts = get_artifacts()
+        if artifacts is None:
+            raise Http404('The OpenAPI schema has not been built.')
+        format = request.GET.get('format')
+        if format not in artifacts:
+            format = 'json' if 'json' in request.headers.get('Accept', '') else 'yaml'
+        artifact = artifacts.get(format) or next(iter(artifacts.values()))
+
+        gzipped = bool(ACCEPTS_GZIP.search(request.headers.get('Accept-Encoding', '')))
+        etag = quote_etag(f'{artifact.etag}-gzip' if gzipped else artifact.etag)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(artifact.gzipped if gzipped else artifact.content,
+                                    content_type=artifact.content_type)
+            if gzipped:
+                response['Content-Encoding'] = 'gzip'
+        response['ETag'] = etag
+        # Shared caches may keep it, but must check back: the schema changes with each deploy.
+        patch_cache_control(response, public=True, no_cache=True)
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        return response
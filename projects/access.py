@@ -0,0 +1,30 @@
+from django.db import DEFAULT_DB_ALIAS
+
+from project_management_tool.invalidation import PerUserCache
+from projects.models import Project, ProjectMember
+
+access_cache = PerUserCache('projects:access', version=1, timeout_setting='PROJECT_ACCESS_CACHE_TIMEOUT')
+
+
+def accessible_project_ids(user):
+    """
+    Return the ids of the projects ``user`` owns or is a member of.
+
+    The set is cached per user and invalidated by the signal handlers in
+    ``projects.signals`` whenever a project or membership changes.
+    """
+    project_ids = access_cache.get(user.pk)
+    if project_ids is None:
+        # Read from the primary: a lagging replica would be cached for the whole timeout.
+        owned = Project.objects.using(DEFAULT_DB_ALIAS).filter(owner_id=user.pk).order_by().values_list('id', flat=True)
+        member_of = ProjectMember.objects.using(DEFAULT_DB_ALIAS).filter(user_id=user.pk).values_list(
+            'project_id', flat=True
+        )
+        project_ids = frozenset(owned.union(member_of))
+        access_cache.set(user.pk, project_ids)
+    return project_ids
+
+
+def invalidate_project_access(*user_ids):
+    """Drop the cached project ids of the given users."""
+    access_cache.invalidate(*user_ids)
@@ -0,0 +1,76 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+
+from project_management_tool.async_views import AsyncReadView
+from project_management_tool.renderers import FastJSONRenderer
+from projects.access import accessible_project_ids
+from projects.events import broker, format_event
+from projects.sync import encode_sync_token
+from projects.views import ProjectViewSet
+
+
+class ProjectListView(AsyncReadView):
+    viewset = ProjectViewSet
+    actions = {'get': 'list', 'post': 'create'}
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Renders error responses of an event stream as a single ``error`` event."""
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return format_event('error', data).encode()
+
+
+class ProjectEventsView(AsyncReadView):
+    """
+    Server-Sent Events stream of a project's task, comment and membership
+    changes (see ``projects.events``). Access is checked once, when the
+    stream opens; losing it ends the stream. Streams also end after
+    ``PROJECT_EVENTS_MAX_AGE`` seconds and when the client falls too far
+    behind; clients reconnect and catch up with ``sync/?since=<last event id>``.
+    """
+    viewset = ProjectViewSet
+    actions = {'get': 'events'}
+    viewset_initkwargs = {'renderer_classes': [EventStreamRenderer, FastJSONRenderer]}
+
+    async def events(self, request, pk=None):
+        try:
+            project_id = int(pk)
+        except (TypeError, ValueError):
+            raise Http404
+        if project_id not in await sync_to_async(accessible_project_ids)(request.user):
+            raise Http404
+
+        response = StreamingHttpResponse(self.stream(project_id, request.user.pk), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Keep proxies such as nginx from buffering the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, project_id, user_id):
+        # Subscribe once streaming starts: a response that is never sent never unsubscribes.
+        subscription = broker.subscribe(project_id, user_id)
+        try:
+            yield format_event('ready', {'project': project_id}, encode_sync_token(timezone.now()))
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.PROJECT_EVENTS_MAX_AGE
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    frame = await asyncio.wait_for(
+                        subscription.get(), min(settings.PROJECT_EVENTS_KEEPALIVE, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                if frame is None:
+                    break
+                yield frame
+        finally:
+            broker.unsubscribe(subscription)
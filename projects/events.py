@@ -0,0 +1,125 @@
+"""
+In-process fan-out of project change events to Server-Sent Events streams.
+
+Signal handlers call ``publish`` for task, comment and membership changes;
+once the transaction commits, the event is formatted once and handed to
+every stream of the project open in this process (see
+``projects.async_views.ProjectEventsView``). Changes made by other processes
+are not seen, so run the writes through the same ASGI server or have
+clients catch up with the sync endpoint: event ids are sync tokens.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from project_management_tool.renderers import FastJSONRenderer
+from projects.sync import encode_sync_token
+
+_renderer = FastJSONRenderer()
+
+
+def format_event(event, data, event_id=None):
+    """Return ``data`` as a Server-Sent Events frame."""
+    frame = f'event: {event}\ndata: {_renderer.render(data).decode()}\n\n'
+    if event_id is not None:
+        frame = f'id: {event_id}\n{frame}'
+    return frame
+
+
+class Subscription:
+    """One stream's queue of frames; ``None`` tells the stream to end."""
+
+    def __init__(self, project_id, user_id):
+        self.project_id = project_id
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(settings.PROJECT_EVENTS_QUEUE_SIZE)
+
+    def deliver(self, frame):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # A client this far behind is better off resyncing from its last event id.
+            self.close()
+
+    def close(self):
+        if self.queue.full():
+            # Make room for the end marker; the client resyncs from its last event id anyway.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class ProjectEventBroker:
+    """Subscriptions by project. Publishing is thread-safe; delivery happens on each stream's loop."""
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, project_id, user_id):
+        subscription = Subscription(project_id, user_id)
+        with self._lock:
+            self._subscriptions[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.project_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.project_id]
+
+    def has_subscribers(self, project_id=None):
+        if project_id is None:
+            return bool(self._subscriptions)
+        return project_id in self._subscriptions
+
+    def _call(self, project_id, method, *args, user_id=None):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(project_id, ()))
+        for subscription in subscriptions:
+            if user_id is not None and subscription.user_id != user_id:
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(getattr(subscription, method), *args)
+            except RuntimeError:  # the stream's loop is gone
+                self.unsubscribe(subscription)
+
+    def publish(self, project_id, frame):
+        self._call(project_id, 'deliver', frame)
+
+    def disconnect(self, project_id, user_id=None):
+        """End the project's streams, or only ``user_id``'s."""
+        self._call(project_id, 'close', user_id=user_id)
+
+
+broker = ProjectEventBroker()
+
+
+def publish(project_id, event, get_data):
+    """
+    Send ``event`` to the project's streams once the current transaction
+    commits. ``get_data()`` is only called when there are streams to send to.
+    """
+    if project_id is None or not broker.has_subscribers(project_id):
+        return
+    data = get_data()
+
+    def send():
+        broker.publish(project_id, format_event(event, data, encode_sync_token(timezone.now())))
+    transaction.on_commit(send)
+
+
+def disconnect(project_id, user_id=None):
+    """End streams whose authorization may no longer hold once the current transaction commits."""
+    if broker.has_subscribers(project_id):
+        transaction.on_commit(lambda: broker.disconnect(project_id, user_id))
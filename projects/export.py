@@ -0,0 +1,62 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from comments.models import Comment
+from task.models import Task
+
+EXPORT_CHUNK_SIZE = 2000
+
+TASK_COLUMNS = ['id', 'title', 'description', 'status', 'priority', 'assigned_to_id',
+                'created_at', 'updated_at', 'due_date']
+COMMENT_COLUMNS = ['id', 'task_id', 'user_id', 'content', 'created_at', 'updated_at']
+CSV_COLUMNS = ['type'] + TASK_COLUMNS + [column for column in COMMENT_COLUMNS if column not in TASK_COLUMNS]
+
+
+def export_rows(project_id):
+    """
+    Yield flat ``dict`` rows for every task of the project, then every
+    comment. Rows are read with chunked iterators straight from
+    ``values()`` so memory stays constant regardless of project size.
+    """
+    tasks = Task.objects.filter(project_id=project_id).order_by('id').values(*TASK_COLUMNS)
+    for row in tasks.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {'type': 'task', **row}
+
+    comments = Comment.objects.filter(task__project_id=project_id).order_by('id').values(*COMMENT_COLUMNS)
+    for row in comments.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {'type': 'comment', **row}
+
+
+def ndjson_stream(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(rows):
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_COLUMNS)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+async def async_stream(stream):
+    """
+    Serve a sync ``stream`` under ASGI, where Django would otherwise collect
+    it whole before sending the first byte. Lines are pulled a chunk at a
+    time on the thread the ORM runs on, so memory stays bounded by a chunk.
+    """
+    next_chunk = sync_to_async(lambda: ''.join(islice(stream, EXPORT_CHUNK_SIZE)))
+    while chunk := await next_chunk():
+        yield chunk
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from projects.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS.'
+
+    def handle(self, *args, **options):
+        count = prune_tombstones(timezone.now())
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} tombstones'))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectmember',
+            index=models.Index(fields=['user', 'project'], name='member_user_project_idx'),
+        ),
+    ]
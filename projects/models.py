@@ -10,6 +10,10 @@ class Project(models.Model):
     description = models.TextField()
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='owned_projects')
     created_at = models.DateTimeField(default=timezone.now)
+    # Bumped whenever the project, its members, tasks or comments change;
+    # used to build cheap ETag/Last-Modified validators.
+    revision = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ['-created_at']
@@ -17,6 +21,17 @@ class Project(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            # revision and updated_at are only written by bump_project_revision(): saving the
+            # loaded values would undo bumps made since, and reissue revisions clients hold.
+            skipped = self.get_deferred_fields() | {'revision', 'updated_at'}
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+        super().save(*args, **kwargs)
+
 
 class ProjectMember(models.Model):
     ROLE_CHOICES = [
@@ -30,6 +45,34 @@ class ProjectMember(models.Model):
 
     class Meta:
         unique_together = ['project', 'user']
+        indexes = [
+            models.Index(fields=['user', 'project'], name='member_user_project_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.project.name} ({self.role})"
+
+
+class Tombstone(models.Model):
+    """
+    Records a deleted task or comment so delta sync can report removals.
+    ``project_id`` is a plain column: tombstones are written while a project
+    is being cascade-deleted and must not reference it.
+    """
+    KIND_CHOICES = [
+        ('task', 'Task'),
+        ('comment', 'Comment'),
+    ]
+
+    project_id = models.BigIntegerField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project_id', 'deleted_at'], name='tombstone_project_deleted_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.project.name} ({self.role})"
\ No newline at end of file
+        return f"{self.kind} {self.object_id} deleted from project {self.project_id}"
\ No newline at end of file
@@ -0,0 +1,21 @@
+from django.db.models import Prefetch
+
+from projects.models import ProjectMember
+
+
+def member_prefetch(lookup='members'):
+    """Prefetch project members together with their users."""
+    return Prefetch(lookup, queryset=ProjectMember.objects.select_related('user'))
+
+
+def with_project_graph(queryset, prefix=''):
+    """
+    Attach the relations rendered by ProjectSerializer: the owner is joined
+    and members (with their users) are prefetched in one extra query.
+
+    ``prefix`` lets querysets of other models that nest a project
+    (e.g. ``'project__'`` for tasks) reuse the same graph.
+    """
+    return queryset.select_related(f'{prefix}owner').prefetch_related(
+        member_prefetch(f'{prefix}members')
+    )
@@ -0,0 +1,15 @@
+from django.db import models
+from django.utils import timezone
+
+from projects.models import Project
+
+
+def bump_project_revision(project_ids):
+    """
+    Mark projects as changed so their ETag/Last-Modified validators change.
+    ``project_ids`` may be a list of ids or a ``values('project_id')`` queryset.
+    """
+    Project.objects.filter(id__in=project_ids).update(
+        revision=models.F('revision') + 1,
+        updated_at=timezone.now(),
+    )
@@ -1,25 +1,32 @@
 from rest_framework import serializers
 
-from project_management_tool.serializers import UserSerializer
+from project_management_tool.serializers import ExpandableFieldsMixin, UserSerializer
 from projects.models import ProjectMember, Project
 
 
-class ProjectMemberSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+class ProjectMemberSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'user': (UserSerializer, {'read_only': True}),
+    }
 
     class Meta:
         model = ProjectMember
         fields = ['id', 'user', 'role']
+        read_only_fields = ['user']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
-    owner = UserSerializer(read_only=True)
-    members = ProjectMemberSerializer(many=True, read_only=True)
+class ProjectSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    members = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    expandable_fields = {
+        'owner': (UserSerializer, {'read_only': True}),
+        'members': (ProjectMemberSerializer, {'many': True, 'read_only': True}),
+    }
 
     class Meta:
         model = Project
         fields = ['id', 'name', 'description', 'owner', 'created_at', 'members']
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'owner', 'created_at']
 
     def validate_name(self, value):
         if not value or not value.strip():
@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from project_management_tool.representations import invalidate_representations, represented_fields_changed
+from project_management_tool.serializers import UserSerializer
+from projects import events
+from projects.access import accessible_project_ids, invalidate_project_access
+from projects.models import Project, ProjectMember, Tombstone
+from projects.revisions import bump_project_revision
+from projects.serializers import ProjectMemberSerializer
+
+
+@receiver(post_init, sender=Project)
+def remember_project_owner(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred owner_id does not trigger a query.
+    instance._loaded_owner_id = instance.__dict__.get('owner_id')
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, **kwargs):
+    invalidate_representations(('project', instance.pk))
+    if created:
+        invalidate_project_access(instance.owner_id)
+    else:
+        bump_project_revision([instance.pk])
+        if instance.owner_id != instance._loaded_owner_id:
+            invalidate_project_access(instance.owner_id, instance._loaded_owner_id)
+            events.disconnect(instance.pk, instance._loaded_owner_id)
+    instance._loaded_owner_id = instance.owner_id
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    # Memberships are cascade-deleted and invalidate their own users.
+    invalidate_project_access(instance.owner_id)
+    invalidate_representations(('project', instance.pk))
+    events.disconnect(instance.pk)
+    # Written by the cascade-deleted tasks and comments; nobody can sync them now.
+    Tombstone.objects.filter(project_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def membership_changed(sender, instance, signal, **kwargs):
+    invalidate_project_access(instance.user_id)
+    invalidate_representations(('project', instance.project_id))
+    bump_project_revision([instance.project_id])
+    if signal is post_delete:
+        events.publish(instance.project_id, 'member.deleted', lambda: {'id': instance.pk, 'user': instance.user_id})
+        events.disconnect(instance.project_id, instance.user_id)
+    else:
+        events.publish(instance.project_id, 'member.saved', lambda: ProjectMemberSerializer(instance).data)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields, **kwargs):
+    # Projects render their owner and members. Deleting a user deletes
+    # the projects and memberships, whose own handlers take care of that.
+    if not created and represented_fields_changed(UserSerializer, update_fields):
+        invalidate_representations(*(('project', project_id) for project_id in accessible_project_ids(instance)))
@@ -0,0 +1,112 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db.models import Q
+
+from projects.models import Tombstone
+
+# Rows are stamped when saved but only become visible on commit, so a sync
+# re-sends changes from slightly before the token. Clients upsert by id.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Order in which a capped sync walks the changes, each stream by (time, id).
+SYNC_STREAMS = ('tasks', 'comments', 'deleted')
+
+# Where a capped sync stopped: the changes after ``since`` (None for a full
+# sync) are being read as of ``started``, and ``stream`` continues after
+# (``after_time``, ``after_id``), or from its start when those are None.
+SyncPosition = namedtuple('SyncPosition', ['started', 'since', 'stream', 'after_time', 'after_id'])
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+# Exact integer microseconds: continuation tokens resume right after a row's
+# timestamp, which a float round trip could move.
+def _micros(moment):
+    return (moment - _EPOCH) // timedelta(microseconds=1)
+
+
+def _moment(micros):
+    return _EPOCH + timedelta(microseconds=int(micros))
+
+
+def encode_sync_token(moment, position=None):
+    """
+    Return an opaque token for ``moment``, or one that continues a capped
+    sync from ``position`` (a ``SyncPosition``).
+    """
+    if position is None:
+        value = str(_micros(moment))
+    else:
+        value = '.'.join([
+            str(_micros(position.started)),
+            '' if position.since is None else str(_micros(position.since)),
+            position.stream,
+            '' if position.after_time is None else str(_micros(position.after_time)),
+            '' if position.after_id is None else str(position.after_id),
+        ])
+    return urlsafe_b64encode(value.encode('ascii')).decode('ascii')
+
+
+def decode_sync_token(token):
+    """
+    Return the datetime encoded by ``encode_sync_token``, or the ``SyncPosition``
+    of a continuation token; raise ValueError if malformed.
+    """
+    value = urlsafe_b64decode(token.encode('ascii')).decode('ascii')
+    if '.' not in value:
+        return _moment(value)
+    started, since, stream, after_time, after_id = value.split('.')
+    if stream not in SYNC_STREAMS:
+        raise ValueError(f'Unknown sync stream {stream!r}')
+    return SyncPosition(
+        _moment(started),
+        _moment(since) if since else None,
+        stream,
+        _moment(after_time) if after_time else None,
+        int(after_id) if after_id else None,
+    )
+
+
+def read_sync_page(streams, started, since, position, limit):
+    """
+    Read up to ``limit`` rows from ``streams`` (a mapping of each name in
+    SYNC_STREAMS to a queryset and the name of its time field), resuming at
+    ``position`` if given. Return the rows of each stream and the
+    ``SyncPosition`` to continue from, or None once every stream is read.
+    """
+    rows = {name: [] for name in SYNC_STREAMS}
+    first = SYNC_STREAMS.index(position.stream) if position else 0
+    for name in SYNC_STREAMS[first:]:
+        queryset, time_field = streams[name]
+        if position and name == position.stream and position.after_time is not None:
+            queryset = queryset.filter(
+                Q(**{f'{time_field}__gt': position.after_time})
+                | Q(**{time_field: position.after_time, 'id__gt': position.after_id})
+            )
+        # One extra row tells whether the stream goes on past the cap.
+        page = list(queryset.order_by(time_field, 'id')[:limit + 1])
+        if len(page) > limit:
+            rows[name] = page[:limit]
+            if not rows[name]:
+                # The cap was reached by the streams before; start this one next time.
+                return rows, SyncPosition(started, since, name, None, None)
+            last = rows[name][-1]
+            return rows, SyncPosition(started, since, name, getattr(last, time_field), last.pk)
+        rows[name] = page
+        limit -= len(page)
+    return rows, None
+
+
+def tombstone_cutoff(now):
+    """Return the moment before which tombstones are pruned and delta syncs need a full resync."""
+    return now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def prune_tombstones(now):
+    """Delete tombstones past the retention window and return how many were removed."""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=tombstone_cutoff(now)).delete()
+    return deleted
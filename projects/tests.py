@@ -1,3 +1,513 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from comments.models import Comment
+from project_management_tool.authentication import ClaimsRefreshToken, user_states
+from project_management_tool.representations import get_representation_cache
+from project_management_tool.testing import ProjectFixtureMixin
+from projects.access import accessible_project_ids
+from projects.events import broker
+from projects.models import Project, ProjectMember, Tombstone
+from projects.sync import decode_sync_token, encode_sync_token
+from task.models import Task
+
+
+class QueryCountMixin:
+    """
+    Asserts that an endpoint issues the same number of queries regardless
+    of how many rows it returns.
+    """
+
+    def count_queries(self, url):
+        # Warm up per-user caches so only the steady-state cost is counted.
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, url, add_rows, expected=None):
+        add_rows()
+        baseline = self.count_queries(url)
+        add_rows()
+        add_rows()
+        self.assertEqual(self.count_queries(url), baseline)
+        if expected is not None:
+            self.assertEqual(baseline, expected)
+
+
+class ProjectQueryCountTests(QueryCountMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.counter = 0
+
+    def make_user(self):
+        self.counter += 1
+        return User.objects.create_user(username=f'user{self.counter}', password='testpass123')
+
+    def make_project(self):
+        project = Project.objects.create(name='Project', description='', owner=self.user)
+        ProjectMember.objects.create(project=project, user=self.user, role='Admin')
+        ProjectMember.objects.create(project=project, user=self.make_user())
+        return project
+
+    def test_project_list_query_count_is_constant(self):
+        # projects, then members joined with their users
+        self.assertConstantQueries(reverse('project-list'), self.make_project, expected=2)
+
+    def test_project_retrieve_query_count_is_constant(self):
+        project = self.make_project()
+
+        def add_members():
+            ProjectMember.objects.create(project=project, user=self.make_user())
+
+        self.assertConstantQueries(reverse('project-detail', args=[project.pk]), add_members)
+
+    def test_project_tasks_query_count_is_constant(self):
+        project = self.make_project()
+
+        def add_task():
+            Task.objects.create(title='Task', description='', project=project, assigned_to=self.make_user())
+
+        self.assertConstantQueries(reverse('project-detail', args=[project.pk]) + 'tasks/', add_task)
+
+
+class ProjectAccessCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', password='testpass123')
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.project = Project.objects.create(name='Project', description='', owner=self.owner)
+
+    def test_ids_are_cached(self):
+        self.assertEqual(accessible_project_ids(self.owner), {self.project.pk})
+        with self.assertNumQueries(0):
+            self.assertEqual(accessible_project_ids(self.owner), {self.project.pk})
+
+    def test_membership_changes_invalidate(self):
+        self.assertEqual(accessible_project_ids(self.other), set())
+        member = ProjectMember.objects.create(project=self.project, user=self.other)
+        self.assertEqual(accessible_project_ids(self.other), {self.project.pk})
+        member.delete()
+        self.assertEqual(accessible_project_ids(self.other), set())
+
+    def test_owner_change_invalidates_both_owners(self):
+        accessible_project_ids(self.owner)
+        accessible_project_ids(self.other)
+        project = Project.objects.get(pk=self.project.pk)
+        project.owner = self.other
+        project.save()
+        self.assertEqual(accessible_project_ids(self.owner), set())
+        self.assertEqual(accessible_project_ids(self.other), {self.project.pk})
+
+    def test_project_delete_invalidates(self):
+        accessible_project_ids(self.owner)
+        self.project.delete()
+        self.assertEqual(accessible_project_ids(self.owner), set())
+
+
+class ProjectStatsTests(ProjectFixtureMixin, APITestCase):
+    def test_counts_are_aggregated(self):
+        past = timezone.now() - timedelta(days=1)
+        Task.objects.create(title='A', description='', project=self.project, status='To Do',
+                            priority='High', assigned_to=self.user, due_date=past)
+        Task.objects.create(title='B', description='', project=self.project, status='Done',
+                            priority='High', assigned_to=self.user, due_date=past)
+        Task.objects.create(title='C', description='', project=self.project, status='In Progress',
+                            priority='Low')
+
+        response = self.client.get(reverse('project-stats', args=[self.project.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 3)
+        self.assertEqual(response.data['overdue'], 1)
+        self.assertEqual(response.data['by_status']['Done'], 1)
+        self.assertEqual(response.data['by_priority'], {'Low': 1, 'Medium': 0, 'High': 2})
+        self.assertEqual(response.data['by_status_priority']['To Do']['High'], 1)
+        self.assertEqual(response.data['workload'], [
+            {'assigned_to': self.user.pk, 'total': 2, 'open': 1, 'overdue': 1},
+            {'assigned_to': None, 'total': 1, 'open': 1, 'overdue': 0},
+        ])
+
+    def test_values_outside_the_choices(self):
+        legacy = Task.objects.create(title='A', description='', project=self.project)
+        Task.objects.create(title='B', description='', project=self.project, status='To Do')
+        # Values save() no longer accepts, as left by older code.
+        Task.objects.filter(pk=legacy.pk).update(status='Blocked', priority='Urgent')
+        Task.objects.exclude(pk=legacy.pk).update(priority='Urgent')
+
+        response = self.client.get(reverse('project-stats', args=[self.project.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['by_status']['Blocked'], 1)
+        self.assertEqual(response.data['by_priority']['Urgent'], 2)
+        self.assertEqual(response.data['by_status_priority']['To Do']['Urgent'], 1)
+
+
+class ProjectConditionalGetTests(ProjectFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(title='Task', description='', project=self.project)
+
+    def assertRevalidates(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        # access ids are cached, so a revalidation is a single lookup
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_retrieve(self):
+        def rename():
+            self.project.name = 'Renamed'
+            self.project.save()
+
+        self.assertRevalidates(reverse('project-detail', args=[self.project.pk]), rename)
+
+    def test_saving_stale_project_keeps_revision(self):
+        url = reverse('project-detail', args=[self.project.pk])
+        stale = Project.objects.get(pk=self.project.pk)
+        etag = self.client.get(url)['ETag']
+        Task.objects.create(title='Another', description='', project=self.project)
+        bumped = Project.objects.get(pk=self.project.pk).revision
+
+        stale.name = 'Renamed'
+        stale.save()
+        self.assertEqual(Project.objects.get(pk=self.project.pk).revision, bumped + 1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['name'], 'Renamed')
+
+    def test_tasks(self):
+        self.assertRevalidates(
+            reverse('project-detail', args=[self.project.pk]) + 'tasks/',
+            lambda: Task.objects.create(title='Another', description='', project=self.project),
+        )
+
+    def test_task_comments(self):
+        self.assertRevalidates(
+            reverse('task-comments', args=[self.task.pk]),
+            lambda: Comment.objects.create(content='Hi', user=self.user, task=self.task),
+        )
+
+    def test_validators_differ_per_query(self):
+        url = reverse('project-detail', args=[self.project.pk])
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url + '?expand=owner', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_no_access_is_not_found(self):
+        other = User.objects.create_user(username='other', password='testpass123')
+        self.client.force_authenticate(other)
+        response = self.client.get(reverse('project-detail', args=[self.project.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+class ProjectSyncTests(ProjectFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('project-sync', args=[self.project.pk])
+        self.old = timezone.now() - timedelta(hours=1)
+
+    def age(self, *objects):
+        for obj in objects:
+            type(obj).objects.filter(pk=obj.pk).update(updated_at=self.old)
+
+    def test_initial_sync_returns_everything(self):
+        task = Task.objects.create(title='Task', description='', project=self.project)
+        Comment.objects.create(content='Hi', user=self.user, task=task)
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data['tasks']), 1)
+        self.assertEqual(len(response.data['comments']), 1)
+        self.assertTrue(response.data['token'])
+
+    def test_delta_sync_returns_changes_and_tombstones(self):
+        unchanged = Task.objects.create(title='Unchanged', description='', project=self.project)
+        changed = Task.objects.create(title='Changed', description='', project=self.project)
+        doomed = Task.objects.create(title='Doomed', description='', project=self.project)
+        comment = Comment.objects.create(content='Hi', user=self.user, task=doomed)
+        self.age(unchanged, changed, doomed, comment)
+        Tombstone.objects.create(project_id=self.project.pk, kind='task', object_id=12345, deleted_at=self.old)
+        token = encode_sync_token(self.old + timedelta(minutes=1))
+
+        changed.status = 'Done'
+        changed.save()
+        doomed_id = doomed.pk
+        doomed.delete()
+        response = self.client.get(self.url, {'since': token})
+
+        self.assertEqual([task['id'] for task in response.data['tasks']], [changed.pk])
+        self.assertEqual(response.data['comments'], [])
+        self.assertEqual(response.data['deleted'], {'tasks': [doomed_id], 'comments': [comment.pk]})
+
+    def test_invalid_token(self):
+        response = self.client.get(self.url, {'since': 'not-a-token'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_capped_sync_continues_from_token(self):
+        tasks = [Task.objects.create(title=f'Task {n}', description='', project=self.project) for n in range(3)]
+        comment = Comment.objects.create(content='Hi', user=self.user, task=tasks[0])
+        deleted_id = tasks.pop().pk
+        Task.objects.filter(pk=deleted_id).delete()
+        token = encode_sync_token(self.old)
+
+        pages = []
+        while True:
+            response = self.client.get(self.url, {'since': token})
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            token = response.data['token']
+            if not response.data['has_more']:
+                break
+
+        self.assertEqual([len(page['tasks']) + len(page['comments']) for page in pages], [2, 1])
+        self.assertEqual([task['id'] for page in pages for task in page['tasks']], [tasks[0].pk, tasks[1].pk])
+        self.assertEqual([item['id'] for page in pages for item in page['comments']], [comment.pk])
+        self.assertEqual(pages[1]['deleted'], {'tasks': [deleted_id], 'comments': []})
+        # The finished sync's token resumes from when it started.
+        self.assertEqual(decode_sync_token(token), decode_sync_token(pages[0]['token']).started)
+
+    def test_expired_token_requires_full_resync(self):
+        token = encode_sync_token(timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1))
+        response = self.client.get(self.url, {'since': token})
+        self.assertEqual(response.status_code, 410)
+
+    def test_prune_tombstones(self):
+        expired = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+        Tombstone.objects.create(project_id=self.project.pk, kind='task', object_id=1, deleted_at=expired)
+        kept = Tombstone.objects.create(project_id=self.project.pk, kind='task', object_id=2)
+        out = io.StringIO()
+        call_command('prune_tombstones', stdout=out)
+        self.assertIn('Deleted 1 tombstones', out.getvalue())
+        self.assertEqual(list(Tombstone.objects.all()), [kept])
+
+    def test_project_delete_drops_tombstones(self):
+        Task.objects.create(title='Task', description='', project=self.project).delete()
+        self.project.delete()
+        self.assertFalse(Tombstone.objects.exists())
+
+
+class ProjectExportTests(ProjectFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(title='Task', description='Multi\nline', project=self.project)
+        self.comment = Comment.objects.create(content='Hi, there', user=self.user, task=self.task)
+        self.url = reverse('project-export', args=[self.project.pk])
+
+    def test_ndjson(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([(row['type'], row['id']) for row in rows],
+                         [('task', self.task.pk), ('comment', self.comment.pk)])
+        self.assertEqual(rows[1]['task_id'], self.task.pk)
+
+    def test_csv(self):
+        response = self.client.get(self.url, {'output': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['type'] for row in rows], ['task', 'comment'])
+        self.assertEqual(rows[0]['description'], 'Multi\nline')
+        self.assertEqual(rows[1]['content'], 'Hi, there')
+
+    def test_invalid_output(self):
+        self.assertEqual(self.client.get(self.url, {'output': 'xml'}).status_code, 400)
+
+    async def test_asgi_streams_asynchronously(self):
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        with mock.patch('projects.export.EXPORT_CHUNK_SIZE', 1):
+            response = await self.async_client.get(self.url, headers={'Authorization': f'Bearer {token}'})
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual([json.loads(chunk)['type'] for chunk in chunks], ['task', 'comment'])
+
+
+class ProjectAsyncReadTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_states.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        for name in ('First', 'Second'):
+            project = Project.objects.create(name=name, description='', owner=self.user)
+            ProjectMember.objects.create(project=project, user=self.user, role='Admin')
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        self.headers = {'Authorization': f'Bearer {token}'}
+        self.url = reverse('project-list')
+
+    async def test_list_matches_sync_view(self):
+        response = await self.async_client.get(self.url + '?page_size=1', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        expected = await sync_to_async(self.client.get)(self.url + '?page_size=1', headers=self.headers)
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(response.json()['results'][0]['name'], 'Second')
+
+    async def test_writes_use_the_sync_viewset(self):
+        response = await self.async_client.post(self.url, {'name': 'Third', 'description': 'Details'},
+                                                content_type='application/json', headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(await Project.objects.filter(name='Third', owner=self.user).aexists())
+
+
+@override_settings(REPRESENTATION_CACHE_BACKEND='project_management_tool.representations.LocalBackend')
+class ProjectRepresentationCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        get_representation_cache.cache_clear()
+        self.addCleanup(get_representation_cache.cache_clear)
+        get_representation_cache().clear()
+        self.owner = User.objects.create_user(username='owner', password='testpass123')
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.project = Project.objects.create(name='Project', description='', owner=self.owner)
+        ProjectMember.objects.create(project=self.project, user=self.owner, role='Admin')
+        self.client.force_authenticate(self.owner)
+        self.url = reverse('project-detail', args=[self.project.pk])
+
+    def test_detail_is_cached(self):
+        first = self.client.get(self.url, {'expand': 'owner,members.user'}).data
+        # Only the ETag validators are looked up.
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url, {'expand': 'owner,members.user'}).data, first)
+        self.assertNotIn('description', self.client.get(self.url, {'fields': 'id,name'}).data)
+
+    def test_writes_invalidate(self):
+        params = {'expand': 'owner,members.user'}
+        self.client.get(self.url, params)
+        self.client.patch(self.url, {'name': 'Renamed'})
+        self.assertEqual(self.client.get(self.url, params).data['name'], 'Renamed')
+
+        ProjectMember.objects.create(project=self.project, user=self.other)
+        self.assertEqual(len(self.client.get(self.url, params).data['members']), 2)
+
+        self.other.first_name = 'Ada'
+        self.other.save()
+        members = self.client.get(self.url, params).data['members']
+        self.assertIn('Ada', [member['user']['first_name'] for member in members])
+
+    def test_last_login_does_not_invalidate(self):
+        self.client.get(self.url)
+        self.owner.last_login = timezone.now()
+        self.owner.save(update_fields=['last_login'])
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_cached_detail_checks_access(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    @override_settings(REPRESENTATION_CACHE_BACKEND='project_management_tool.representations.DjangoCacheBackend')
+    def test_django_cache_backend(self):
+        get_representation_cache.cache_clear()
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).data['name'], 'Project')
+        self.client.patch(self.url, {'name': 'Renamed'})
+        self.assertEqual(self.client.get(self.url).data['name'], 'Renamed')
+
+    @override_settings(REPRESENTATION_CACHE_BACKEND=None)
+    def test_disabled_without_backend(self):
+        get_representation_cache.cache_clear()
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.url).data['name'], 'Project')
+        self.assertGreater(len(queries), 1)
+
+
+class ProjectEventStreamTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_states.clear()
+        self.owner = User.objects.create_user(username='owner', password='testpass123')
+        self.member = User.objects.create_user(username='member', password='testpass123')
+        self.project = Project.objects.create(name='Project', description='', owner=self.owner)
+        self.membership = ProjectMember.objects.create(project=self.project, user=self.member)
+        self.url = reverse('project-events', args=[self.project.pk], urlconf='project_management_tool.asgi_urls')
+
+    def headers(self, user):
+        return {'Authorization': f'Bearer {ClaimsRefreshToken.for_user(user).access_token}'}
+
+    def committed(self, write):
+        with self.captureOnCommitCallbacks(execute=True):
+            return write()
+
+    async def open(self, user):
+        response = await self.async_client.get(self.url, headers=self.headers(user))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await self.next_frame(stream)).startswith(b'id: '))  # ready, with a sync token
+        return stream
+
+    async def next_frame(self, stream):
+        return await asyncio.wait_for(anext(stream), timeout=5)
+
+    async def test_changes_are_pushed(self):
+        stream = await self.open(self.member)
+        task = await sync_to_async(self.committed)(
+            lambda: Task.objects.create(title='Pushed', description='', project=self.project)
+        )
+        frame = await self.next_frame(stream)
+        self.assertIn(b'event: task.saved', frame)
+        self.assertIn(b'"title":"Pushed"', frame)
+
+        await sync_to_async(self.committed)(
+            lambda: Comment.objects.create(content='Hi', task=task, user=self.member)
+        )
+        self.assertIn(b'event: comment.saved', await self.next_frame(stream))
+
+        await sync_to_async(self.committed)(task.delete)
+        self.assertIn(b'event: comment.deleted', await self.next_frame(stream))
+        self.assertIn(b'event: task.deleted', await self.next_frame(stream))
+
+    async def test_removed_member_is_disconnected(self):
+        stream = await self.open(self.member)
+        await sync_to_async(self.committed)(self.membership.delete)
+        self.assertIn(b'event: member.deleted', await self.next_frame(stream))
+        with self.assertRaises(StopAsyncIteration):
+            await self.next_frame(stream)
+
+    async def test_outsiders_are_rejected(self):
+        outsider = await User.objects.acreate(username='outsider')
+        response = await self.async_client.get(self.url, headers=self.headers(outsider))
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    async def test_lagging_stream_is_ended(self):
+        with override_settings(PROJECT_EVENTS_QUEUE_SIZE=2):
+            subscription = broker.subscribe(self.project.pk, self.member.pk)
+        try:
+            for _ in range(3):
+                subscription.deliver('event: task.saved\ndata: {}\n\n')
+            self.assertIsNone(await subscription.get())
+        finally:
+            broker.unsubscribe(subscription)
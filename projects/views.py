@@ -1,27 +1,60 @@
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, F, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from projects.models import Project, ProjectMember
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from project_management_tool.conditional import conditional_on_revision
+from project_management_tool.replicas import ReplicaReadMixin
+from project_management_tool.representations import CachedRetrieveMixin
+from projects.access import accessible_project_ids
+from projects.export import async_stream, csv_stream, export_rows, ndjson_stream
+from projects.models import Project, ProjectMember, Tombstone
+from projects.querysets import with_project_graph
 from projects.serializers import ProjectSerializer
+from projects.sync import (
+    SYNC_OVERLAP, SyncPosition, decode_sync_token, encode_sync_token, read_sync_page, tombstone_cutoff,
+)
 from task.models import Task
+from task.querysets import with_task_graph
 from task.serializers import TaskSerializer
 
 
 # Create your views here.
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ReplicaReadMixin, CachedRetrieveMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
+    representation_label = 'project'
 
     def get_queryset(self):
         # Users can only see projects they own or are members of
-        return Project.objects.filter(
-            models.Q(owner=self.request.user) |
-            models.Q(members__user=self.request.user)
-        ).distinct()
+        return with_project_graph(Project.objects.filter(id__in=accessible_project_ids(self.request.user)))
+
+    def get_representation_scope(self, instance):
+        return instance.pk
+
+    def representation_visible(self, scope):
+        return scope in accessible_project_ids(self.request.user)
+
+    def get_revision_validators(self, pk=None, **kwargs):
+        try:
+            project_id = int(pk)
+        except (TypeError, ValueError):
+            return None
+        if project_id not in accessible_project_ids(self.request.user):
+            return None
+        return Project.objects.filter(pk=project_id).values_list('revision', 'updated_at').first()
+
+    @conditional_on_revision(get_revision_validators)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         project = serializer.save(owner=self.request.user)
@@ -70,8 +103,120 @@ class ProjectViewSet(viewsets.ModelViewSet):
             return Response({'error': 'User not found'}, status=404)
 
     @action(detail=True, methods=['get'])
+    @conditional_on_revision(get_revision_validators)
     def tasks(self, request, pk=None):
         project = self.get_object()
+        tasks = with_task_graph(Task.objects.filter(project=project))
+        page = self.paginate_queryset(tasks)
+        serializer = TaskSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        project = self.get_object()
+        tasks = Task.objects.filter(project=project).order_by()
+        open_tasks = ~Q(status='Done')
+        overdue = open_tasks & Q(due_date__lt=timezone.now())
+
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+        by_status_priority = {status: dict.fromkeys(priorities, 0) for status in statuses}
+        by_priority = dict.fromkeys(priorities, 0)
+        total = overdue_total = 0
+        for row in tasks.values('status', 'priority').annotate(
+            count=Count('id'), overdue=Count('id', filter=overdue)
+        ):
+            # Legacy rows or renamed choices may hold values not in the choices; count them as stored.
+            counts = by_status_priority.setdefault(row['status'], dict.fromkeys(priorities, 0))
+            counts[row['priority']] = row['count']
+            by_priority[row['priority']] = by_priority.get(row['priority'], 0) + row['count']
+            total += row['count']
+            overdue_total += row['overdue']
+
+        workload = tasks.values('assigned_to').annotate(
+            total=Count('id'),
+            open=Count('id', filter=open_tasks),
+            overdue=Count('id', filter=overdue),
+        ).order_by(F('assigned_to').asc(nulls_last=True))
+
+        return Response({
+            'total': total,
+            'overdue': overdue_total,
+            'by_status': {status: sum(counts.values()) for status, counts in by_status_priority.items()},
+            'by_priority': by_priority,
+            'by_status_priority': by_status_priority,
+            'workload': list(workload),
+        })
+
+    @action(detail=True, methods=['get'])
+    def sync(self, request, pk=None):
+        """
+        Return tasks and comments changed since ``?since=<token>`` plus the ids
+        deleted in that window. Without a token, the full current state is
+        returned. Pass the returned ``token`` to the next call; while
+        ``has_more`` is true it continues the same sync. Tokens older than the
+        tombstone retention window get a 410: the client must resync in full.
+        """
+        project = self.get_object()
+        now = timezone.now()
+        started, since, position = now, None, None
+
+        token = request.query_params.get('since')
+        if token:
+            try:
+                decoded = decode_sync_token(token)
+            except (ValueError, UnicodeError):
+                return Response({'error': 'Invalid sync token'}, status=400)
+            if isinstance(decoded, SyncPosition):
+                started, since, position = decoded.started, decoded.since, decoded
+            else:
+                since = decoded - SYNC_OVERLAP
+            if since is not None and since < tombstone_cutoff(now):
+                return Response({'error': 'Sync token expired; full resync required'}, status=410)
+
         tasks = Task.objects.filter(project=project)
-        serializer = TaskSerializer(tasks, many=True)
-        return Response(serializer.data)
+        comments = Comment.objects.filter(task__project=project)
+        tombstones = Tombstone.objects.filter(project_id=project.pk)
+        if since is not None:
+            tasks = tasks.filter(updated_at__gt=since)
+            comments = comments.filter(updated_at__gt=since)
+            tombstones = tombstones.filter(deleted_at__gt=since)
+        streams = {
+            'tasks': (tasks, 'updated_at'),
+            'comments': (comments, 'updated_at'),
+            'deleted': (tombstones, 'deleted_at'),
+        }
+        rows, position = read_sync_page(streams, started, since, position, settings.SYNC_PAGE_SIZE)
+
+        deleted = {'tasks': [], 'comments': []}
+        for tombstone in rows['deleted']:
+            deleted[f'{tombstone.kind}s'].append(tombstone.object_id)
+
+        context = self.get_serializer_context()
+        return Response({
+            'tasks': TaskSerializer(rows['tasks'], many=True, context=context).data,
+            'comments': CommentSerializer(rows['comments'], many=True, context=context).data,
+            'deleted': deleted,
+            # A finished sync continues from when it started, so the next one
+            # also picks up what changed while it was being paged.
+            'token': encode_sync_token(started, position),
+            'has_more': position is not None,
+        })
+
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        """Stream every task and comment of the project as NDJSON (default) or CSV (``?output=csv``)."""
+        project = self.get_object()
+        output = request.query_params.get('output', 'ndjson')
+        if output == 'csv':
+            stream, content_type = csv_stream(export_rows(project.pk)), 'text/csv'
+        elif output == 'ndjson':
+            stream, content_type = ndjson_stream(export_rows(project.pk)), 'application/x-ndjson'
+        else:
+            return Response({'error': 'Invalid output. Must be ndjson or csv'}, status=400)
+
+        if isinstance(request._request, ASGIRequest):
+            stream = async_stream(stream)
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="project-{project.pk}.{output}"'
+        return response
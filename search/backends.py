@@ -0,0 +1,175 @@
+import re
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, models
+from django.utils.module_loading import import_string
+
+from search.models import SearchTerm
+
+TERM_PATTERN = re.compile(r'\w+')
+MAX_TERM_LENGTH = 64
+# Title matches count this many times more than body matches.
+TITLE_WEIGHT = 4.0
+
+SearchDocument = namedtuple('SearchDocument', ['kind', 'object_id', 'project_id', 'title', 'body'])
+SearchHit = namedtuple('SearchHit', ['kind', 'object_id', 'score'])
+
+
+def tokenize(text):
+    return [term[:MAX_TERM_LENGTH] for term in TERM_PATTERN.findall(text.lower())]
+
+
+class BaseSearchBackend:
+    """Interface implemented by the search backends."""
+
+    def index(self, documents):
+        """Add or replace the given ``SearchDocument``s."""
+        raise NotImplementedError
+
+    def remove(self, kind, object_ids):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def search(self, query, project_ids, kinds=None, limit=20, offset=0):
+        """
+        Return ``SearchHit``s matching every term of ``query`` within
+        ``project_ids``, best first. The last term matches as a prefix.
+        """
+        raise NotImplementedError
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    Backend on an SQLite FTS5 virtual table ranked with bm25. The rowid
+    encodes ``(kind, object_id)`` so updates and removals are rowid lookups.
+    """
+    table = 'search_fts'
+    kinds = {'task': 0, 'comment': 1}
+
+    def _rowid(self, kind, object_id):
+        return object_id * len(self.kinds) + self.kinds[kind]
+
+    def index(self, documents):
+        rows = [
+            (self._rowid(doc.kind, doc.object_id), doc.title, doc.body, doc.kind, doc.project_id)
+            for doc in documents
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {self.table} (rowid, title, body, kind, project_id) '
+                f'VALUES (%s, %s, %s, %s, %s)',
+                rows
+            )
+
+    def remove(self, kind, object_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.table} WHERE rowid = %s',
+                [(self._rowid(kind, object_id),) for object_id in object_ids]
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+
+    def search(self, query, project_ids, kinds=None, limit=20, offset=0):
+        terms = tokenize(query)
+        if not terms or not project_ids:
+            return []
+
+        match = ' '.join(f'"{term}"' for term in terms) + '*'
+        project_ids = list(project_ids)
+        sql = (
+            f'SELECT rowid, kind, bm25({self.table}, %s, 1.0) AS rank FROM {self.table} '
+            f'WHERE {self.table} MATCH %s AND project_id IN ({", ".join(["%s"] * len(project_ids))})'
+        )
+        params = [TITLE_WEIGHT, match, *project_ids]
+        if kinds:
+            sql += f' AND kind IN ({", ".join(["%s"] * len(kinds))})'
+            params.extend(kinds)
+        sql += ' ORDER BY rank LIMIT %s OFFSET %s'
+        params.extend([limit, offset])
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            # bm25() is lower-is-better; flip it so scores grow with relevance.
+            return [
+                SearchHit(kind, rowid // len(self.kinds), -rank)
+                for rowid, kind, rank in cursor.fetchall()
+            ]
+
+
+class InvertedIndexBackend(BaseSearchBackend):
+    """Portable backend on the ``SearchTerm`` postings table."""
+
+    def index(self, documents):
+        documents = list(documents)
+        for kind in {doc.kind for doc in documents}:
+            self.remove(kind, [doc.object_id for doc in documents if doc.kind == kind])
+
+        postings = []
+        for doc in documents:
+            weights = Counter()
+            for term in tokenize(doc.title):
+                weights[term] += TITLE_WEIGHT
+            for term in tokenize(doc.body):
+                weights[term] += 1.0
+            postings.extend(
+                SearchTerm(term=term, kind=doc.kind, object_id=doc.object_id,
+                           project_id=doc.project_id, weight=weight)
+                for term, weight in weights.items()
+            )
+        SearchTerm.objects.bulk_create(postings, batch_size=1000)
+
+    def remove(self, kind, object_ids):
+        SearchTerm.objects.filter(kind=kind, object_id__in=list(object_ids)).delete()
+
+    def clear(self):
+        SearchTerm.objects.all().delete()
+
+    def search(self, query, project_ids, kinds=None, limit=20, offset=0):
+        terms = tokenize(query)
+        if not terms or not project_ids:
+            return []
+
+        exact, prefix = set(terms[:-1]), terms[-1]
+        matches_prefix = models.Q(term__startswith=prefix)
+        matches = matches_prefix
+        if exact:
+            matches_exact = models.Q(term__in=exact)
+            matches |= matches_exact
+        postings = SearchTerm.objects.filter(matches, project_id__in=list(project_ids))
+        if kinds:
+            postings = postings.filter(kind__in=kinds)
+
+        # Every exact term and at least one prefix completion must match.
+        rows = postings.values('kind', 'object_id').annotate(
+            score=models.Sum('weight'),
+            prefix_matched=models.Count('term', filter=matches_prefix),
+        ).filter(prefix_matched__gt=0)
+        if exact:
+            rows = rows.annotate(
+                exact_matched=models.Count('term', filter=matches_exact, distinct=True),
+            ).filter(exact_matched=len(exact))
+        rows = rows.order_by('-score', 'kind', 'object_id')
+
+        return [
+            SearchHit(row['kind'], row['object_id'], row['score'])
+            for row in rows[offset:offset + limit]
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    """Return the configured backend; FTS5 on SQLite, the postings table elsewhere."""
+    path = settings.SEARCH_BACKEND
+    if path is None:
+        if connection.vendor == 'sqlite':
+            path = 'search.backends.SQLiteFTSBackend'
+        else:
+            path = 'search.backends.InvertedIndexBackend'
+    return import_string(path)()
@@ -0,0 +1,33 @@
+from itertools import chain, islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from comments.models import Comment
+from search.backends import SearchDocument, get_backend
+from search.signals import task_document
+from task.models import Task
+
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index from all tasks and comments.'
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        tasks = Task.objects.order_by().only('id', 'project_id', 'title', 'description')
+        comments = Comment.objects.order_by().values_list('id', 'task__project_id', 'content')
+        documents = chain(
+            (task_document(task) for task in tasks.iterator(chunk_size=BATCH_SIZE)),
+            (SearchDocument('comment', comment_id, project_id, '', content)
+             for comment_id, project_id, content in comments.iterator(chunk_size=BATCH_SIZE)),
+        )
+
+        count = 0
+        with transaction.atomic():
+            backend.clear()
+            while batch := list(islice(documents, BATCH_SIZE)):
+                backend.index(batch)
+                count += len(batch)
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} documents'))
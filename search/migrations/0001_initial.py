@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('comment', 'Comment')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('project_id', models.BigIntegerField()),
+                ('weight', models.FloatField(default=1.0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'project_id'], name='searchterm_term_project_idx'), models.Index(fields=['kind', 'object_id'], name='searchterm_object_idx')],
+            },
+        ),
+    ]
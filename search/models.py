@@ -0,0 +1,28 @@
+from django.db import models
+
+
+# Create your models here.
+class SearchTerm(models.Model):
+    """
+    One posting of the portable inverted index used by
+    ``search.backends.InvertedIndexBackend``.
+    """
+    KIND_CHOICES = [
+        ('task', 'Task'),
+        ('comment', 'Comment'),
+    ]
+
+    term = models.CharField(max_length=64)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    project_id = models.BigIntegerField()
+    weight = models.FloatField(default=1.0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'project_id'], name='searchterm_term_project_idx'),
+            models.Index(fields=['kind', 'object_id'], name='searchterm_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} -> {self.kind} {self.object_id}"
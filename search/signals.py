@@ -0,0 +1,44 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from comments.models import Comment
+from search.backends import SearchDocument, get_backend
+from task.models import Task
+from task.signals import tasks_bulk_saved
+
+
+def task_document(task):
+    return SearchDocument('task', task.pk, task.project_id, task.title, task.description)
+
+
+def comment_document(comment, project_id):
+    return SearchDocument('comment', comment.pk, project_id, '', comment.content)
+
+
+@receiver(post_save, sender=Task)
+def index_task(sender, instance, **kwargs):
+    get_backend().index([task_document(instance)])
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def index_tasks(sender, tasks, **kwargs):
+    get_backend().index([task_document(task) for task in tasks])
+
+
+@receiver(post_delete, sender=Task)
+def unindex_task(sender, instance, **kwargs):
+    get_backend().remove('task', [instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, **kwargs):
+    if Comment.task.is_cached(instance):
+        project_id = instance.task.project_id
+    else:
+        project_id = Task.objects.filter(id=instance.task_id).values_list('project_id', flat=True).first()
+    get_backend().index([comment_document(instance, project_id)])
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_comment(sender, instance, **kwargs):
+    get_backend().remove('comment', [instance.pk])
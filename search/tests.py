@@ -0,0 +1,114 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from comments.models import Comment
+from projects.models import Project, ProjectMember
+from search.backends import InvertedIndexBackend, SQLiteFTSBackend, get_backend
+from task.models import Task
+
+
+class SearchFixtureMixin:
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.project = Project.objects.create(name='Project', description='', owner=self.user)
+        ProjectMember.objects.create(project=self.project, user=self.user, role='Admin')
+        self.hidden = Project.objects.create(name='Hidden', description='', owner=self.other)
+
+        self.title_hit = Task.objects.create(title='Database migration', description='Plan it',
+                                             project=self.project)
+        self.body_hit = Task.objects.create(title='Cleanup', description='After the database migration',
+                                            project=self.project)
+        self.comment = Comment.objects.create(content='The migration script is ready',
+                                              user=self.user, task=self.body_hit)
+        Task.objects.create(title='Database migration', description='', project=self.hidden)
+
+
+class SearchViewTests(SearchFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('search')
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [(result['type'], result['object']['id']) for result in response.data['results']]
+
+    def test_ranked_and_scoped_to_accessible_projects(self):
+        self.assertEqual(self.search(q='database migration'), [
+            ('task', self.title_hit.pk),
+            ('task', self.body_hit.pk),
+        ])
+
+    def test_prefix_and_type_filter(self):
+        self.assertEqual(self.search(q='scri', type='comment'), [('comment', self.comment.pk)])
+
+    def test_index_follows_changes(self):
+        self.title_hit.title = 'Renamed'
+        self.title_hit.description = ''
+        self.title_hit.save()
+        self.body_hit.delete()
+        self.assertEqual(self.search(q='migration'), [])
+
+    def test_pagination(self):
+        response = self.client.get(self.url, {'q': 'migration', 'page_size': 1})
+        self.assertEqual(len(response.data['results']), 1)
+        second = self.client.get(response.data['next'])
+        self.assertEqual(len(second.data['results']), 1)
+        self.assertIsNotNone(second.data['previous'])
+
+    def test_fields_without_id(self):
+        response = self.client.get(self.url, {'q': 'migration', 'type': 'task', 'fields': 'title'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['object'] for result in response.data['results']], [
+            {'title': 'Database migration'},
+            {'title': 'Cleanup'},
+        ])
+
+    def test_query_required(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+
+
+class InvertedIndexBackendTests(SearchFixtureMixin, TestCase):
+    def setUp(self):
+        get_backend.cache_clear()
+        with override_settings(SEARCH_BACKEND='search.backends.InvertedIndexBackend'):
+            super().setUp()
+        self.backend = InvertedIndexBackend()
+
+    def tearDown(self):
+        get_backend.cache_clear()
+
+    def hits(self, query, **kwargs):
+        return [(hit.kind, hit.object_id) for hit in self.backend.search(query, {self.project.pk}, **kwargs)]
+
+    def test_ranked_and_scoped(self):
+        self.assertEqual(self.hits('database migration'), [
+            ('task', self.title_hit.pk),
+            ('task', self.body_hit.pk),
+        ])
+
+    def test_prefix_and_kind_filter(self):
+        self.assertEqual(self.hits('scri', kinds=['comment']), [('comment', self.comment.pk)])
+
+    def test_remove(self):
+        self.backend.remove('task', [self.title_hit.pk, self.body_hit.pk])
+        self.assertEqual(self.hits('database'), [])
+
+
+class RebuildSearchIndexTests(SearchFixtureMixin, TestCase):
+    def test_rebuild(self):
+        SQLiteFTSBackend().clear()
+        out = io.StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 4 documents', out.getvalue())
+        hits = SQLiteFTSBackend().search('migration', {self.project.pk})
+        self.assertEqual(len(hits), 3)
@@ -0,0 +1,75 @@
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from projects.access import accessible_project_ids
+from search.backends import get_backend
+from task.models import Task
+from task.serializers import TaskSerializer
+
+
+# Create your views here.
+class SearchView(APIView):
+    """
+    Ranked full-text search over task titles/descriptions and comment
+    content in the projects the user can access. ``?q=`` is required;
+    ``?type=task|comment`` narrows the results, ``?page=``/``?page_size=`` page them.
+    """
+    permission_classes = [IsAuthenticated]
+    page_size = 20
+    max_page_size = 100
+    kinds = {
+        'task': (Task, TaskSerializer),
+        'comment': (Comment, CommentSerializer),
+    }
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q is required'}, status=400)
+
+        kind = request.query_params.get('type')
+        if kind is not None and kind not in self.kinds:
+            return Response({'error': 'Invalid type. Must be task or comment'}, status=400)
+
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', self.page_size)), 1), self.max_page_size)
+        except ValueError:
+            return Response({'error': 'page and page_size must be integers'}, status=400)
+
+        hits = get_backend().search(
+            query,
+            accessible_project_ids(request.user),
+            kinds=[kind] if kind else None,
+            limit=page_size + 1,
+            offset=(page - 1) * page_size,
+        )
+        has_next = len(hits) > page_size
+        hits = hits[:page_size]
+
+        context = {'request': request, 'view': self}
+        representations = {}
+        for name, (model, serializer_class) in self.kinds.items():
+            objects = model.objects.in_bulk([hit.object_id for hit in hits if hit.kind == name])
+            data = serializer_class(list(objects.values()), many=True, context=context).data
+            # Keyed by pk, not item['id'], which ?fields= may leave out.
+            representations[name] = dict(zip(objects.keys(), data))
+
+        url = request.build_absolute_uri()
+        return Response({
+            'next': replace_query_param(url, 'page', page + 1) if has_next else None,
+            'previous': (
+                None if page == 1 else
+                remove_query_param(url, 'page') if page == 2 else
+                replace_query_param(url, 'page', page - 1)
+            ),
+            'results': [
+                {'type': hit.kind, 'score': hit.score, 'object': representations[hit.kind][hit.object_id]}
+                for hit in hits
+                if hit.object_id in representations[hit.kind]
+            ],
+        })
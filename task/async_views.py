@@ -0,0 +1,47 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404
+
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from project_management_tool.async_views import AsyncReadView
+from project_management_tool.conditional import conditional_on_revision
+from projects.access import accessible_project_ids
+from task.models import Task
+from task.views import TaskViewSet
+
+
+class TaskListView(AsyncReadView):
+    viewset = TaskViewSet
+    actions = {'get': 'list', 'post': 'create'}
+
+
+class TaskCommentsView(AsyncReadView):
+    viewset = TaskViewSet
+    actions = {'get': 'comments'}
+
+    async def get_tasks(self):
+        project_ids = await sync_to_async(accessible_project_ids)(self.request.user)
+        return Task.objects.filter(project_id__in=project_ids)
+
+    async def get_revision_validators(self, pk=None, **kwargs):
+        try:
+            task_id = int(pk)
+        except (TypeError, ValueError):
+            return None
+        tasks = await self.get_tasks()
+        return await tasks.filter(pk=task_id).values_list('project__revision', 'project__updated_at').afirst()
+
+    @conditional_on_revision(get_revision_validators)
+    async def comments(self, request, pk=None):
+        try:
+            task_id = int(pk)
+        except (TypeError, ValueError):
+            raise Http404
+        if not await (await self.get_tasks()).filter(pk=task_id).aexists():
+            raise Http404
+
+        page = await self.view.paginator.apaginate_queryset(
+            Comment.objects.filter(task_id=task_id), request, view=self.view
+        )
+        serializer = CommentSerializer(page, many=True, context=self.view.get_serializer_context())
+        return self.view.get_paginated_response(await self.serialize(serializer))
@@ -0,0 +1,33 @@
+from project_management_tool.invalidation import PerUserCache
+
+OPEN_STATUSES = ['To Do', 'In Progress']
+
+my_work_cache = PerUserCache('task:my-work', version=1, timeout_setting='MY_WORK_CACHE_TIMEOUT')
+
+
+def my_work_queryset(user, project_ids):
+    """Open tasks assigned to ``user`` in the projects they can still access."""
+    return user.assigned_tasks.filter(project_id__in=project_ids, status__in=OPEN_STATUSES)
+
+
+def get_my_work_snapshot(user, project_ids):
+    """
+    Return the cached first page of ``user``'s feed, or ``None``.
+
+    The snapshot remembers the project ids it was built for, so losing or
+    gaining access to a project makes it stale without a separate hook.
+    Task changes invalidate it through the handlers in ``task.signals``.
+    """
+    snapshot = my_work_cache.get(user.pk)
+    if snapshot is None or snapshot['project_ids'] != project_ids:
+        return None
+    return snapshot
+
+
+def set_my_work_snapshot(user, project_ids, results, next_token):
+    my_work_cache.set(user.pk, {'project_ids': project_ids, 'results': results, 'next': next_token})
+
+
+def invalidate_my_work(*user_ids):
+    """Drop the cached feed snapshots of the given users."""
+    my_work_cache.invalidate(*user_ids)
@@ -0,0 +1,99 @@
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from comments.models import Comment
+from project_management_tool.authentication import ClaimsRefreshToken
+from task.management.commands import benchmark_indexes
+
+
+class Command(benchmark_indexes.Command):
+    help = (
+        'Compare the throughput of the hot read endpoints (project list, task list, '
+        'task comments) served through the sync WSGI handler and the async ASGI '
+        'handler at increasing numbers of concurrent requests.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=20_000)
+        parser.add_argument('--comments', type=int, default=5_000)
+        parser.add_argument('--projects', type=int, default=50)
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64, 256],
+                            help='Numbers of requests in flight to measure at.')
+        parser.add_argument('--requests', type=int, default=1000,
+                            help='Requests per measurement, spread over the endpoints.')
+        parser.add_argument('--wsgi-threads', type=int, default=16,
+                            help='Worker threads of the WSGI side; requests beyond that queue.')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows afterwards.')
+
+    def handle(self, *args, **options):
+        users, projects = self.seed(options)
+        try:
+            self.analyze()
+            cache.clear()
+            user = User.objects.filter(username__in=[u.username for u in users],
+                                       project_memberships__isnull=False).first()
+            task_id = Comment.objects.filter(
+                task__project__members__user=user
+            ).values_list('task_id', flat=True).first()
+            urls = [reverse('project-list'), reverse('task-list')]
+            if task_id is not None:
+                urls.append(reverse('task-comments', args=[task_id]))
+            token = ClaimsRefreshToken.for_user(user).access_token
+            self.headers = {'Authorization': f'Bearer {token}'}
+
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                'Requests per second (%d requests over %s)' % (options['requests'], ', '.join(urls))
+            ))
+            self.stdout.write(f"  {'in flight':>10}{'WSGI':>12}{'ASGI':>12}")
+            # The test clients send Host: testserver.
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                for concurrency in options['concurrency']:
+                    threads = min(concurrency, options['wsgi_threads'])
+                    wsgi = self.run_wsgi(urls, options['requests'], threads)
+                    asgi = asyncio.run(self.run_asgi(urls, options['requests'], concurrency))
+                    self.stdout.write(f'  {concurrency:>10}{wsgi:12.1f}{asgi:12.1f}')
+        finally:
+            if not options['keep']:
+                self.cleanup()
+
+    def assert_ok(self, url, response):
+        if response.status_code != 200:
+            raise RuntimeError(f'{url}: HTTP {response.status_code} {response.content[:200]!r}')
+
+    def run_wsgi(self, urls, total, threads):
+        local = threading.local()
+
+        def fetch(url):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            self.assert_ok(url, local.client.get(url, headers=self.headers))
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(fetch, itertools.islice(itertools.cycle(urls), total)))
+        return total / (time.perf_counter() - started)
+
+    async def run_asgi(self, urls, total, concurrency):
+        client = AsyncClient()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def fetch(url):
+            async with slots:
+                # Like ASGIHandler: sync work of one request shares one thread.
+                async with ThreadSensitiveContext():
+                    self.assert_ok(url, await client.get(url, headers=self.headers))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch(url) for url in itertools.islice(itertools.cycle(urls), total)))
+        return total / (time.perf_counter() - started)
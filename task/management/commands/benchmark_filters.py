@@ -0,0 +1,80 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from task.management.commands import benchmark_indexes
+from task.views import TaskViewSet
+
+
+class Command(benchmark_indexes.Command):
+    help = (
+        'Grow a synthetic data set step by step and time filtered task list requests '
+        'through TaskViewSet, showing how latency scales with the number of tasks.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--steps', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                            help='Total task counts to measure at.')
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows afterwards.')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        users, projects = self.seed_people(options['users'], options['projects'])
+        try:
+            user = User.objects.filter(project_memberships__isnull=False, username__in=[
+                bench_user.username for bench_user in users
+            ]).first()
+            view = TaskViewSet.as_view({'get': 'list'})
+            factory = APIRequestFactory()
+            queries = self.build_queries(user)
+            timings = {name: [] for name in queries}
+
+            seeded = 0
+            for total in sorted(options['steps']):
+                self.stdout.write(f'Seeding up to {total} tasks...')
+                self.seed_tasks(users, projects, seeded, total)
+                seeded = total
+                self.analyze()
+                cache.clear()
+
+                for name, params in queries.items():
+                    best = float('inf')
+                    for _ in range(self.repeat):
+                        request = factory.get('/tasks/', params, SERVER_NAME='localhost')
+                        force_authenticate(request, user=user)
+                        started = time.perf_counter()
+                        response = view(request)
+                        response.render()
+                        best = min(best, time.perf_counter() - started)
+                    if response.status_code != 200:
+                        raise RuntimeError(f'{name}: HTTP {response.status_code} {response.data}')
+                    timings[name].append(best)
+
+            steps = sorted(options['steps'])
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                'Best of %d, ms per request (page of 50)' % self.repeat
+            ))
+            self.stdout.write('  ' + f"{'tasks':<24}" + ''.join(f'{step:>12}' for step in steps))
+            for name, values in timings.items():
+                self.stdout.write('  ' + f'{name:<24}' + ''.join(f'{value * 1000:12.2f}' for value in values))
+        finally:
+            if not options['keep']:
+                self.cleanup()
+
+    def build_queries(self, user):
+        now = timezone.now()
+        return {
+            'status + priority': {'status': 'To Do', 'priority': 'High'},
+            'assignee': {'assigned_to': user.pk},
+            'due date range': {
+                'due_after': (now - timezone.timedelta(days=1)).isoformat(),
+                'due_before': (now + timezone.timedelta(days=1)).isoformat(),
+            },
+            'ordering=-updated_at': {'ordering': '-updated_at'},
+        }
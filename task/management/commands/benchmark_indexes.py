@@ -0,0 +1,173 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from comments.models import Comment
+from projects.models import Project, ProjectMember
+from task.models import Task
+
+BATCH_SIZE = 5000
+BENCH_PREFIX = 'bench_indexes_'
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a large synthetic data set and report query plans and timings for the '
+        'hot list queries with and without the composite indexes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1_000_000)
+        parser.add_argument('--comments', type=int, default=200_000)
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows afterwards.')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        users, projects = self.seed(options)
+        try:
+            user = users[0]
+            project = projects[0]
+            task = Task.objects.filter(project=project).first()
+            queries = {
+                'tasks by project': Task.objects.filter(project=project).order_by('-created_at')[:50],
+                'tasks by assignee/status': Task.objects.filter(assigned_to=user, status='To Do')[:50],
+                'comments by task': Comment.objects.filter(task=task).order_by('-created_at')[:50],
+                'memberships by user': ProjectMember.objects.filter(user=user).values('project_id'),
+            }
+            indexes = [
+                (model, index)
+                for model in (Task, Comment, ProjectMember)
+                for index in model._meta.indexes
+            ]
+
+            self.stdout.write(self.style.MIGRATE_HEADING('Without composite indexes'))
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.remove_index(model, index)
+            self.analyze()
+            try:
+                before = self.measure(queries)
+            finally:
+                with connection.schema_editor() as editor:
+                    for model, index in indexes:
+                        editor.add_index(model, index)
+                self.analyze()
+
+            self.stdout.write(self.style.MIGRATE_HEADING('With composite indexes'))
+            after = self.measure(queries)
+
+            self.stdout.write(self.style.MIGRATE_HEADING('Summary (best of %d)' % self.repeat))
+            for name in queries:
+                self.stdout.write(
+                    f'  {name:<28} {before[name] * 1000:10.3f} ms -> {after[name] * 1000:10.3f} ms'
+                )
+        finally:
+            if not options['keep']:
+                self.cleanup()
+
+    def seed(self, options):
+        self.stdout.write(
+            f"Seeding {options['tasks']} tasks and {options['comments']} comments "
+            f"across {options['projects']} projects..."
+        )
+        users, projects = self.seed_people(options['users'], options['projects'])
+        self.seed_tasks(users, projects, 0, options['tasks'])
+
+        now = timezone.now()
+        task_ids = list(Task.objects.filter(project__in=projects).values_list('id', flat=True)[:10_000])
+        for start in range(0, options['comments'], BATCH_SIZE):
+            Comment.objects.bulk_create([
+                Comment(
+                    content=f'Comment {i}',
+                    user=random.choice(users),
+                    task_id=random.choice(task_ids),
+                    created_at=now - timezone.timedelta(seconds=i),
+                )
+                for i in range(start, min(start + BATCH_SIZE, options['comments']))
+            ])
+
+        return users, projects
+
+    def seed_people(self, user_count, project_count):
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=f'{BENCH_PREFIX}{i}', password='!')
+                for i in range(user_count)
+            ])
+            projects = Project.objects.bulk_create([
+                Project(name=f'{BENCH_PREFIX}{i}', description='', owner=random.choice(users))
+                for i in range(project_count)
+            ])
+            ProjectMember.objects.bulk_create([
+                ProjectMember(project=project, user=user)
+                for project in projects
+                for user in random.sample(users, min(10, len(users)))
+            ])
+        return users, projects
+
+    def seed_tasks(self, users, projects, first, last):
+        """Bulk insert tasks numbered ``first`` to ``last``; signals are skipped."""
+        now = timezone.now()
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+        for start in range(first, last, BATCH_SIZE):
+            tasks = [
+                Task(
+                    title=f'Task {i}',
+                    description='',
+                    status=random.choice(statuses),
+                    priority=random.choice(priorities),
+                    assigned_to=random.choice(users),
+                    project=random.choice(projects),
+                    created_at=now - timezone.timedelta(seconds=i),
+                    due_date=now + timezone.timedelta(hours=random.randint(-720, 720)),
+                )
+                for i in range(start, min(start + BATCH_SIZE, last))
+            ]
+            for task in tasks:
+                task.priority_rank = Task.rank_priority(task.priority)
+            Task.objects.bulk_create(tasks)
+
+    def analyze(self):
+        # Refresh planner statistics so plans reflect the current index set.
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def measure(self, queries):
+        timings = {}
+        for name, queryset in queries.items():
+            self.stdout.write(f'  {name}:')
+            for line in queryset.explain().splitlines():
+                self.stdout.write(f'    {line}')
+            best = float('inf')
+            for _ in range(self.repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                best = min(best, time.perf_counter() - started)
+            timings[name] = best
+        return timings
+
+    def cleanup(self):
+        self.stdout.write('Removing seeded rows...')
+        # Seeded rows never went through the model signals (search index,
+        # tombstones, revisions), so bulk delete them with plain SQL.
+        project_ids = list(Project.objects.filter(name__startswith=BENCH_PREFIX).values_list('id', flat=True))
+        tasks = Task._meta.db_table
+        with connection.cursor() as cursor:
+            for start in range(0, len(project_ids), 500):
+                batch = project_ids[start:start + 500]
+                placeholders = ', '.join(['%s'] * len(batch))
+                cursor.execute(
+                    f'DELETE FROM {Comment._meta.db_table} WHERE task_id IN '
+                    f'(SELECT id FROM {tasks} WHERE project_id IN ({placeholders}))',
+                    batch
+                )
+                cursor.execute(f'DELETE FROM {tasks} WHERE project_id IN ({placeholders})', batch)
+        User.objects.filter(username__startswith=BENCH_PREFIX).delete()
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:59
+
+from django.db import migrations, models
+
+
+def backfill_priority_rank(apps, schema_editor):
+    Task = apps.get_model('task', 'Task')
+    for priority, rank in {'High': 0, 'Low': 2}.items():
+        Task.objects.filter(priority=priority).update(priority_rank=rank)
+    # Priorities outside the choices sort last, as Task.rank_priority() ranks them.
+    Task.objects.exclude(priority__in=['High', 'Medium', 'Low']).update(priority_rank=3)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0004_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(backfill_priority_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'due_date', 'priority_rank', 'id', 'project', 'status'], name='task_assignee_feed_idx'),
+        ),
+    ]
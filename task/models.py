@@ -19,18 +19,47 @@ class Task(models.Model):
         ('High', 'High'),
     ]
 
+    # Sort key of ``priority`` for the "my work" feed: most urgent first.
+    PRIORITY_RANKS = {'High': 0, 'Medium': 1, 'Low': 2}
+
     title = models.CharField(max_length=255)
     description = models.TextField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='To Do')
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='Medium')
+    priority_rank = models.PositiveSmallIntegerField(default=PRIORITY_RANKS['Medium'], editable=False)
     assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
                                     related_name='assigned_tasks')
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='tasks')
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
     due_date = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', '-created_at'], name='task_project_created_idx'),
+            models.Index(fields=['assigned_to', 'status'], name='task_assignee_status_idx'),
+            models.Index(fields=['project', 'updated_at'], name='task_project_updated_idx'),
+            models.Index(fields=['project', 'status', 'priority'], name='task_project_status_idx'),
+            models.Index(fields=['project', 'due_date'], name='task_project_due_idx'),
+            # Covers the filter and ordering of the "my work" feed; id is listed
+            # before the filter columns so its tiebreaker needs no sort step.
+            models.Index(fields=['assigned_to', 'due_date', 'priority_rank', 'id', 'project', 'status'],
+                         name='task_assignee_feed_idx'),
+        ]
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+    @classmethod
+    def rank_priority(cls, priority):
+        # Legacy rows may hold priorities outside the choices; they sort last.
+        return cls.PRIORITY_RANKS.get(priority, len(cls.PRIORITY_RANKS))
+
+    def save(self, *args, **kwargs):
+        # bulk_create/bulk_update callers set priority_rank themselves.
+        self.priority_rank = self.rank_priority(self.priority)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'priority' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'priority_rank'}
+        super().save(*args, **kwargs)
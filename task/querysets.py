@@ -0,0 +1,10 @@
+from projects.querysets import with_project_graph
+
+
+def with_task_graph(queryset, prefix=''):
+    """
+    Attach the relations rendered by TaskSerializer: the assignee and the
+    project (with its owner) are joined, project members are prefetched.
+    """
+    queryset = queryset.select_related(f'{prefix}assigned_to', f'{prefix}project')
+    return with_project_graph(queryset, prefix=f'{prefix}project__')
@@ -1,30 +1,26 @@
 from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef
 from rest_framework import serializers
 
-from project_management_tool.serializers import UserSerializer
+from project_management_tool.serializers import ExpandableFieldsMixin, UserSerializer
+from projects.models import ProjectMember
 from projects.serializers import ProjectSerializer
 from task.models import Task
 
 
-class TaskSerializer(serializers.ModelSerializer):
-    assigned_to = UserSerializer(read_only=True)
-    project = ProjectSerializer(read_only=True)
+class TaskSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     assigned_to_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
 
+    expandable_fields = {
+        'assigned_to': (UserSerializer, {'read_only': True}),
+        'project': (ProjectSerializer, {'read_only': True}),
+    }
+
     class Meta:
         model = Task
         fields = ['id', 'title', 'description', 'status', 'priority', 'assigned_to',
-                  'assigned_to_id', 'project', 'created_at', 'due_date']
-        read_only_fields = ['id', 'created_at']
-
-    def validate_assigned_to_id(self, value):
-        if value:
-            try:
-                user = User.objects.get(id=value)
-                return value
-            except User.DoesNotExist:
-                raise serializers.ValidationError('User not found')
-        return value
+                  'assigned_to_id', 'project', 'created_at', 'updated_at', 'due_date']
+        read_only_fields = ['id', 'assigned_to', 'project', 'created_at', 'updated_at']
 
     def validate_due_date(self, value):
         if value:
@@ -33,35 +29,66 @@ class TaskSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError('Due date cannot be in the past')
         return value
 
+    def get_project_id(self, attrs):
+        if attrs.get('project'):
+            return attrs['project'].pk
+        if self.instance is not None:
+            return self.instance.project_id
+        # Nested routes pass the project from the URL (see TaskViewSet).
+        return self.context.get('project_id')
+
     def validate(self, attrs):
-        # Validate assigned user is a member of the project
-        assigned_to_id = attrs.get('assigned_to_id')
-        project = attrs.get('project') or (hasattr(self, 'instance') and self.instance and self.instance.project)
-
-        if assigned_to_id and project:
-            from projects.models import ProjectMember
-            try:
-                user = User.objects.get(id=assigned_to_id)
-                if not ProjectMember.objects.filter(project=project, user=user).exists():
-                    raise serializers.ValidationError({
-                        'assigned_to_id': 'User must be a member of the project'
-                    })
-            except User.DoesNotExist:
-                raise serializers.ValidationError({'assigned_to_id': 'User not found'})
+        # Resolve the assignee and check project membership in one query;
+        # the user is handed on to create()/update() via validated_data.
+        if 'assigned_to_id' not in attrs:
+            return attrs
+
+        assigned_to_id = attrs.pop('assigned_to_id')
+        if not assigned_to_id:
+            attrs['assigned_to'] = None
+            return attrs
+
+        project_id = self.get_project_id(attrs)
+        users = User.objects.filter(id=assigned_to_id)
+        if project_id:
+            users = users.annotate(is_member=Exists(
+                ProjectMember.objects.filter(project_id=project_id, user_id=OuterRef('pk'))
+            ))
+        user = users.first()
 
+        if user is None:
+            raise serializers.ValidationError({'assigned_to_id': 'User not found'})
+        if project_id and not user.is_member:
+            raise serializers.ValidationError({
+                'assigned_to_id': 'User must be a member of the project'
+            })
+
+        attrs['assigned_to'] = user
         return attrs
 
-    def create(self, validated_data):
-        assigned_to_id = validated_data.pop('assigned_to_id', None)
-        if assigned_to_id:
-            validated_data['assigned_to'] = User.objects.get(id=assigned_to_id)
-        return super().create(validated_data)
-
-    def update(self, instance, validated_data):
-        assigned_to_id = validated_data.pop('assigned_to_id', None)
-        if assigned_to_id is not None:
-            if assigned_to_id:
-                validated_data['assigned_to'] = User.objects.get(id=assigned_to_id)
-            else:
-                validated_data['assigned_to'] = None
-        return super().update(instance, validated_data)
+
+class TaskBulkOperationSerializer(TaskSerializer):
+    """
+    Validates a single item of a bulk request. Assignee and membership
+    checks are left to the caller, which resolves them for the whole batch
+    in one query.
+    """
+    OP_CHOICES = ['create', 'update', 'delete']
+
+    op = serializers.ChoiceField(choices=OP_CHOICES)
+    id = serializers.IntegerField(required=False)
+    project = serializers.IntegerField(required=False)
+
+    class Meta(TaskSerializer.Meta):
+        fields = ['op', 'id', 'title', 'description', 'status', 'priority',
+                  'assigned_to_id', 'project', 'due_date']
+
+    def validate(self, attrs):
+        op = attrs['op']
+        if op == 'create' and not attrs.get('project'):
+            raise serializers.ValidationError({'project': 'This field is required.'})
+        if op != 'create' and not attrs.get('id'):
+            raise serializers.ValidationError({'id': 'This field is required.'})
+        if op != 'create' and 'project' in attrs:
+            raise serializers.ValidationError({'project': 'Tasks cannot be moved between projects.'})
+        return attrs
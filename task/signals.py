@@ -0,0 +1,67 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from project_management_tool.representations import invalidate_representations, represented_fields_changed
+from project_management_tool.serializers import UserSerializer
+from projects import events
+from projects.models import Tombstone
+from projects.revisions import bump_project_revision
+from task.feed import invalidate_my_work
+from task.models import Task
+from task.serializers import TaskSerializer
+
+# Sent with ``tasks=[...]`` after bulk_create/bulk_update, which skip post_save.
+tasks_bulk_saved = Signal()
+
+
+@receiver(post_init, sender=Task)
+def remember_task_assignee(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred assigned_to_id does not trigger a query.
+    instance._loaded_assigned_to_id = instance.__dict__.get('assigned_to_id')
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, **kwargs):
+    bump_project_revision([instance.project_id])
+    invalidate_representations(('task', instance.pk))
+    invalidate_my_work(instance.assigned_to_id, instance._loaded_assigned_to_id)
+    events.publish(instance.project_id, 'task.saved', lambda: TaskSerializer(instance).data)
+    instance._loaded_assigned_to_id = instance.assigned_to_id
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    bump_project_revision([instance.project_id])
+    invalidate_representations(('task', instance.pk))
+    invalidate_my_work(instance.assigned_to_id)
+    events.publish(instance.project_id, 'task.deleted', lambda: {'id': instance.pk})
+    Tombstone.objects.create(project_id=instance.project_id, kind='task', object_id=instance.pk)
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def task_batch_saved(sender, tasks, **kwargs):
+    bump_project_revision({task.project_id for task in tasks})
+    invalidate_representations(*(('task', task.pk) for task in tasks))
+    invalidate_my_work(*(task.assigned_to_id for task in tasks),
+                       *(task._loaded_assigned_to_id for task in tasks))
+    for task in tasks:
+        task._loaded_assigned_to_id = task.assigned_to_id
+        events.publish(task.project_id, 'task.saved', lambda task=task: TaskSerializer(task).data)
+
+
+def forget_assigned_task_representations(user):
+    task_ids = Task.objects.filter(assigned_to=user).values_list('pk', flat=True)
+    invalidate_representations(*(('task', task_id) for task_id in task_ids))
+
+
+@receiver(post_save, sender=User)
+def assignee_saved(sender, instance, created, update_fields, **kwargs):
+    if not created and represented_fields_changed(UserSerializer, update_fields):
+        forget_assigned_task_representations(instance)
+
+
+@receiver(pre_delete, sender=User)
+def assignee_deleted(sender, instance, **kwargs):
+    # The tasks are unassigned with a bulk UPDATE, which sends no signals.
+    forget_assigned_task_representations(instance)
@@ -1,3 +1,384 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from comments.models import Comment
+from project_management_tool.authentication import ClaimsRefreshToken, user_states
+from project_management_tool.representations import get_representation_cache
+from project_management_tool.testing import ProjectFixtureMixin
+from projects.models import Project, ProjectMember
+from task.models import Task
+
+
+class TaskPaginationTests(ProjectFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        # Identical timestamps force the id tiebreaker to decide the order.
+        created_at = timezone.now()
+        self.tasks = [
+            Task.objects.create(title=f'Task {i}', description='', project=self.project, created_at=created_at)
+            for i in range(5)
+        ]
+
+    def test_pages_follow_created_at_then_id(self):
+        url = reverse('task-list') + '?page_size=2'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [task.id for task in reversed(self.tasks)])
+
+    def test_previous_link_returns_preceding_page(self):
+        first = self.client.get(reverse('task-list') + '?page_size=2')
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        previous = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [task['id'] for task in previous.data['results']],
+            [task['id'] for task in first.data['results']],
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('task-list') + '?cursor=garbage')
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskBulkTests(ProjectFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.member = User.objects.create_user(username='member', password='testpass123')
+        self.outsider = User.objects.create_user(username='outsider', password='testpass123')
+        ProjectMember.objects.create(project=self.project, user=self.member)
+        self.url = reverse('task-bulk')
+
+    def create_operations(self, count):
+        return [
+            {'op': 'create', 'project': self.project.pk, 'title': f'Task {i}', 'description': 'Details',
+             'assigned_to_id': self.member.pk}
+            for i in range(count)
+        ]
+
+    def test_mixed_operations_return_per_item_results(self):
+        existing = Task.objects.create(title='Old', description='', project=self.project)
+        doomed = Task.objects.create(title='Doomed', description='', project=self.project)
+        other = Task.objects.create(title='Other', description='', project=self.project)
+        response = self.client.post(self.url, [
+            {'op': 'create', 'project': self.project.pk, 'title': 'New', 'description': 'Details'},
+            {'op': 'update', 'id': existing.pk, 'status': 'Done', 'assigned_to_id': self.member.pk},
+            {'op': 'delete', 'id': doomed.pk},
+            {'op': 'update', 'id': other.pk, 'assigned_to_id': self.outsider.pk},
+            {'op': 'create', 'title': 'No project', 'description': 'Details'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        statuses = [result['status'] for result in response.data['results']]
+        self.assertEqual(statuses, [201, 200, 204, 400, 400])
+        existing.refresh_from_db()
+        self.assertEqual(existing.status, 'Done')
+        self.assertEqual(existing.assigned_to, self.member)
+        self.assertFalse(Task.objects.filter(pk=doomed.pk).exists())
+        self.assertTrue(Task.objects.filter(title='New').exists())
+
+    def test_duplicate_ids_are_rejected(self):
+        task = Task.objects.create(title='Task', description='', project=self.project)
+        other = Task.objects.create(title='Other', description='', project=self.project)
+        response = self.client.post(self.url, [
+            {'op': 'update', 'id': task.pk, 'title': 'Renamed'},
+            {'op': 'delete', 'id': task.pk},
+            {'op': 'update', 'id': other.pk, 'title': 'Renamed'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['status'] for item in response.data['results']], [400, 400, 200])
+        self.assertIn('id', response.data['results'][0]['errors'])
+        task.refresh_from_db()
+        self.assertEqual(task.title, 'Task')
+
+    def test_query_count_does_not_grow_with_batch(self):
+        self.client.post(self.url, self.create_operations(1), format='json')
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, self.create_operations(2), format='json')
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, self.create_operations(50), format='json')
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertEqual(Task.objects.filter(assigned_to=self.member).count(), 53)
+
+
+class TaskWriteQueryCountTests(ProjectFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.member = User.objects.create_user(username='member', password='testpass123')
+        self.outsider = User.objects.create_user(username='outsider', password='testpass123')
+        ProjectMember.objects.create(project=self.project, user=self.member)
+        self.url = reverse('project-tasks', args=[self.project.pk])
+        # Warm the per-user access cache.
+        self.client.get(self.url)
+
+    def test_create_with_assignee(self):
+        # assignee + membership, INSERT, project revision bump, search index
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, {
+                'title': 'Task', 'description': 'Details', 'assigned_to_id': self.member.pk,
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['assigned_to'], self.member.pk)
+
+    def test_update_with_assignee(self):
+        task = Task.objects.create(title='Task', description='Details', project=self.project)
+        url = reverse('task-detail', args=[task.pk])
+        # task, assignee + membership, UPDATE, project revision bump, search index
+        with self.assertNumQueries(5):
+            response = self.client.patch(url, {'assigned_to_id': self.member.pk}, format='json')
+        self.assertEqual(response.status_code, 200)
+        task.refresh_from_db()
+        self.assertEqual(task.assigned_to, self.member)
+
+        response = self.client.patch(url, {'assigned_to_id': None}, format='json')
+        task.refresh_from_db()
+        self.assertIsNone(task.assigned_to)
+
+    def test_non_member_assignee_is_rejected(self):
+        response = self.client.post(self.url, {
+            'title': 'Task', 'description': 'Details', 'assigned_to_id': self.outsider.pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('assigned_to_id', response.data)
+
+    def test_unknown_assignee_is_rejected(self):
+        response = self.client.post(self.url, {
+            'title': 'Task', 'description': 'Details', 'assigned_to_id': 9999,
+        }, format='json')
+        self.assertEqual(response.data['assigned_to_id'], ['User not found'])
+
+
+class TaskFilterTests(ProjectFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.urgent = Task.objects.create(title='Urgent', description='', project=self.project,
+                                          priority='High', assigned_to=self.user, due_date=now)
+        self.done = Task.objects.create(title='Done', description='', project=self.project,
+                                        status='Done', priority='High')
+        self.later = Task.objects.create(title='Later', description='', project=self.project,
+                                         priority='Low', due_date=now + timedelta(days=7))
+        self.url = reverse('task-list')
+
+    def ids(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [task['id'] for task in response.data['results']]
+
+    def test_status_and_priority(self):
+        self.assertEqual(self.ids({'status': 'To Do', 'priority': 'High'}), [self.urgent.pk])
+
+    def test_assignee_and_due_range(self):
+        self.assertEqual(self.ids({'assigned_to': self.user.pk}), [self.urgent.pk])
+        due_after = (timezone.now() + timedelta(days=1)).isoformat()
+        self.assertEqual(self.ids({'due_after': due_after}), [self.later.pk])
+
+    def test_invalid_value_is_rejected(self):
+        response = self.client.get(self.url, {'status': 'Someday', 'assigned_to': 'me'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'status', 'assigned_to'})
+
+    def test_unsupported_ordering_is_rejected(self):
+        response = self.client.get(self.url, {'ordering': 'title'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_ascending_ordering_pages(self):
+        url = self.url + '?ordering=created_at&page_size=2'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            seen.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [self.urgent.pk, self.done.pk, self.later.pk])
+
+
+class MyWorkFeedTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.project = Project.objects.create(name='Project', description='', owner=self.other)
+        ProjectMember.objects.create(project=self.project, user=self.user)
+        self.url = reverse('task-mine')
+        self.now = timezone.now()
+
+    def make_task(self, title, **kwargs):
+        kwargs.setdefault('assigned_to', self.user)
+        return Task.objects.create(title=title, description='', project=self.project, **kwargs)
+
+    def titles(self, url):
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            titles.extend(task['title'] for task in response.data['results'])
+            url = response.data['next']
+        return titles
+
+    def test_ordered_by_due_date_then_priority(self):
+        tomorrow = self.now + timedelta(days=1)
+        self.make_task('Undated low', priority='Low')
+        self.make_task('Undated high', priority='High')
+        self.make_task('Tomorrow low', priority='Low', due_date=tomorrow)
+        self.make_task('Tomorrow high', priority='High', due_date=tomorrow)
+        self.make_task('Today', due_date=self.now)
+        self.make_task('Done', status='Done', due_date=self.now)
+        self.make_task('Someone else', assigned_to=self.other, due_date=self.now)
+
+        expected = ['Today', 'Tomorrow high', 'Tomorrow low', 'Undated high', 'Undated low']
+        self.assertEqual(self.titles(self.url), expected)
+        for page_size in (1, 2, 3):
+            self.assertEqual(self.titles(f'{self.url}?page_size={page_size}'), expected)
+
+    def test_first_page_is_cached_until_tasks_change(self):
+        task = self.make_task('Task', due_date=self.now)
+        self.client.get(self.url)
+        # access ids and the feed snapshot are both cached
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['title'], 'Task')
+
+        task.title = 'Renamed'
+        task.save()
+        self.assertEqual(self.titles(self.url), ['Renamed'])
+
+        task.assigned_to = self.other
+        task.save()
+        self.assertEqual(self.titles(self.url), [])
+
+    def test_bulk_reassignment_invalidates_both_users(self):
+        task = self.make_task('Task')
+        ProjectMember.objects.create(project=self.project, user=self.other)
+        self.assertEqual(self.titles(self.url), ['Task'])
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.titles(self.url), [])
+
+        self.client.post(reverse('task-bulk'), [
+            {'op': 'update', 'id': task.pk, 'assigned_to_id': self.other.pk, 'priority': 'High'},
+        ], format='json')
+        self.assertEqual(self.titles(self.url), ['Task'])
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.titles(self.url), [])
+        task.refresh_from_db()
+        self.assertEqual(task.priority_rank, Task.PRIORITY_RANKS['High'])
+
+    def test_unknown_priority_sorts_last(self):
+        self.make_task('Low', priority='Low')
+        patched = self.make_task('Patched')
+        bulk = self.make_task('Bulk')
+        # Priorities outside the choices, as left by older code and ranked by the migration.
+        Task.objects.filter(pk__in=[patched.pk, bulk.pk]).update(
+            priority='Urgent', priority_rank=Task.rank_priority('Urgent'),
+        )
+
+        response = self.client.patch(reverse('task-detail', args=[patched.pk]), {'title': 'Patched again'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(reverse('task-bulk'), [{'op': 'update', 'id': bulk.pk, 'title': 'Bulk again'}],
+                                    format='json')
+        self.assertEqual(response.data['results'][0]['status'], 200)
+
+        self.assertEqual(self.titles(self.url), ['Low', 'Patched again', 'Bulk again'])
+
+    def test_losing_access_hides_tasks(self):
+        self.make_task('Task')
+        self.assertEqual(self.titles(self.url), ['Task'])
+        ProjectMember.objects.filter(user=self.user).delete()
+        self.assertEqual(self.titles(self.url), [])
+
+
+class TaskAsyncReadTests(ProjectFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        user_states.clear()
+        self.task = Task.objects.create(title='Task', description='', project=self.project, priority='High')
+        Task.objects.create(title='Other', description='', project=self.project, priority='Low')
+        Comment.objects.create(content='Hi', user=self.user, task=self.task)
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    async def test_list_matches_sync_view(self):
+        url = reverse('task-list') + '?priority=High&expand=project'
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        expected = await sync_to_async(self.client.get)(url, headers=self.headers)
+        self.assertEqual(response.json(), expected.json())
+
+    async def test_errors_are_rendered_by_the_viewset(self):
+        response = await self.async_client.get(reverse('task-list') + '?ordering=title', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.json())
+        response = await self.async_client.get(reverse('task-list'))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response.headers)
+
+    async def test_comments_revalidate(self):
+        url = reverse('task-comments', args=[self.task.pk])
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual([comment['content'] for comment in response.json()['results']], ['Hi'])
+        response = await self.async_client.get(url, headers={**self.headers, 'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+        other = await sync_to_async(User.objects.create_user)(username='other', password='testpass123')
+        token = ClaimsRefreshToken.for_user(other).access_token
+        response = await self.async_client.get(url, headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(REPRESENTATION_CACHE_BACKEND='project_management_tool.representations.LocalBackend')
+class TaskRepresentationCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        get_representation_cache.cache_clear()
+        self.addCleanup(get_representation_cache.cache_clear)
+        get_representation_cache().clear()
+        self.owner = User.objects.create_user(username='owner', password='testpass123')
+        self.assignee = User.objects.create_user(username='assignee', password='testpass123')
+        self.client.force_authenticate(self.owner)
+        self.project = Project.objects.create(name='Project', description='', owner=self.owner)
+        ProjectMember.objects.create(project=self.project, user=self.assignee)
+        self.task = Task.objects.create(title='Task', description='', project=self.project, assigned_to=self.assignee)
+        self.url = reverse('task-detail', args=[self.task.pk])
+        self.params = {'expand': 'project,assigned_to'}
+
+    def test_detail_is_cached(self):
+        first = self.client.get(self.url, self.params).data
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url, self.params).data, first)
+
+    def test_task_and_project_changes_invalidate(self):
+        self.client.get(self.url, self.params)
+        self.client.patch(self.url, {'status': 'Done'})
+        self.assertEqual(self.client.get(self.url, self.params).data['status'], 'Done')
+
+        self.project.name = 'Renamed'
+        self.project.save()
+        self.assertEqual(self.client.get(self.url, self.params).data['project']['name'], 'Renamed')
+
+    def test_assignee_changes_invalidate(self):
+        self.client.get(self.url, self.params)
+        self.assignee.first_name = 'Ada'
+        self.assignee.save()
+        self.assertEqual(self.client.get(self.url, self.params).data['assigned_to']['first_name'], 'Ada')
+
+        self.assignee.delete()
+        self.assertIsNone(self.client.get(self.url, self.params).data['assigned_to'])
+
+    def test_deleted_task_is_gone(self):
+        self.client.get(self.url)
+        self.client.delete(self.url)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
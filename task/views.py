@@ -1,5 +1,8 @@
-from django.db import models
-from django.shortcuts import get_object_or_404
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import Http404
+from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -7,54 +10,233 @@ from rest_framework.response import Response
 
 from comments.models import Comment
 from comments.serializers import CommentSerializer
-from projects.models import Project
+from project_management_tool.conditional import conditional_on_revision
+from project_management_tool.filters import IndexedFilterBackend, choice, datetime_value, id_value
+from project_management_tool.pagination import DueDateCursorPagination
+from project_management_tool.replicas import ReplicaReadMixin
+from project_management_tool.representations import CachedRetrieveMixin
+from projects.access import accessible_project_ids
+from projects.models import ProjectMember
+from task.feed import get_my_work_snapshot, my_work_queryset, set_my_work_snapshot
 from task.models import Task
-from task.serializers import TaskSerializer
+from task.serializers import TaskBulkOperationSerializer, TaskSerializer
+from task.signals import tasks_bulk_saved
 
 
 # Create your views here.
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ReplicaReadMixin, CachedRetrieveMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    representation_label = 'task'
+    filter_backends = [IndexedFilterBackend]
+    # Each filter is served by an index on Task (see Task.Meta.indexes).
+    filter_fields = {
+        'status': ('status', choice(Task.STATUS_CHOICES)),
+        'priority': ('priority', choice(Task.PRIORITY_CHOICES)),
+        'assigned_to': ('assigned_to_id', id_value),
+        'due_after': ('due_date__gte', datetime_value),
+        'due_before': ('due_date__lt', datetime_value),
+    }
+    ordering_fields = ['-created_at', 'created_at', '-updated_at', 'updated_at']
+    bulk_max_operations = 500
 
     def get_queryset(self):
+        project_ids = accessible_project_ids(self.request.user)
         project_id = self.kwargs.get('project_pk')
         if project_id:
             # Ensure user has access to the project
-            try:
-                project = Project.objects.get(
-                    models.Q(id=project_id) &
-                    (models.Q(owner=self.request.user) |
-                     models.Q(members__user=self.request.user))
-                )
-                return Task.objects.filter(project=project)
-            except Project.DoesNotExist:
+            if project_id not in project_ids:
                 return Task.objects.none()
-        return Task.objects.filter(
-            project__in=Project.objects.filter(
-                models.Q(owner=self.request.user) |
-                models.Q(members__user=self.request.user)
-            ).distinct()
-        )
+            return Task.objects.filter(project_id=project_id)
+        return Task.objects.filter(project_id__in=project_ids)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['project_id'] = self.kwargs.get('project_pk')
+        return context
 
     def perform_create(self, serializer):
         project_id = self.kwargs.get('project_pk')
         if project_id:
             # Ensure user has access to the project
-            project = get_object_or_404(
-                Project.objects.filter(
-                    models.Q(id=project_id) &
-                    (models.Q(owner=self.request.user) |
-                     models.Q(members__user=self.request.user))
-                )
-            )
-            serializer.save(project=project)
+            if project_id not in accessible_project_ids(self.request.user):
+                raise Http404
+            serializer.save(project_id=project_id)
         else:
             serializer.save()
 
+    def get_representation_dependencies(self, instance):
+        # ?expand=project renders the project as well.
+        return [('project', instance.project_id)]
+
+    def get_representation_scope(self, instance):
+        return instance.project_id
+
+    def representation_visible(self, scope):
+        return scope in accessible_project_ids(self.request.user)
+
+    def get_revision_validators(self, pk=None, **kwargs):
+        try:
+            task_id = int(pk)
+        except (TypeError, ValueError):
+            return None
+        return Task.objects.filter(
+            pk=task_id, project_id__in=accessible_project_ids(self.request.user)
+        ).values_list('project__revision', 'project__updated_at').first()
+
     @action(detail=True, methods=['get'])
+    @conditional_on_revision(get_revision_validators)
     def comments(self, request, pk=None):
         task = self.get_object()
         comments = Comment.objects.filter(task=task)
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(comments)
+        serializer = CommentSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'], filter_backends=[], pagination_class=DueDateCursorPagination)
+    def mine(self, request):
+        """Open tasks assigned to the current user, soonest due and most urgent first."""
+        project_ids = accessible_project_ids(request.user)
+        # The bare first page is everyone's landing page, so it is served
+        # from a snapshot; cursors, page sizes and field selection are not.
+        cacheable = not request.query_params
+        snapshot = get_my_work_snapshot(request.user, project_ids) if cacheable else None
+        if snapshot is None:
+            queryset = my_work_queryset(request.user, project_ids)
+            if cacheable:
+                # Snapshots outlive replication lag, so build them from the primary.
+                queryset = queryset.using(DEFAULT_DB_ALIAS)
+            page = self.paginate_queryset(queryset)
+            results = self.get_serializer(page, many=True).data
+            if not cacheable:
+                return self.get_paginated_response(results)
+            snapshot = {'results': list(results), 'next': self.paginator.get_next_token()}
+            set_my_work_snapshot(request.user, project_ids, snapshot['results'], snapshot['next'])
+
+        return Response({
+            'next': self.paginator.get_link(request, snapshot['next']),
+            'previous': None,
+            'results': snapshot['results'],
+        })
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Apply a list of ``{"op": "create" | "update" | "delete", ...}`` task
+        operations in one transaction and return a result per item.
+        """
+        operations = request.data
+        if not isinstance(operations, list):
+            return Response({'error': 'Expected a list of task operations'}, status=400)
+        if len(operations) > self.bulk_max_operations:
+            return Response(
+                {'error': f'At most {self.bulk_max_operations} operations are allowed per request'},
+                status=400
+            )
+
+        results = [None] * len(operations)
+        valid = []
+        for index, operation in enumerate(operations):
+            partial = not isinstance(operation, dict) or operation.get('op') != 'create'
+            serializer = TaskBulkOperationSerializer(data=operation, partial=partial)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {'status': 400, 'errors': serializer.errors}
+
+        # Operations on one task would all act on the same in_bulk() instance.
+        id_counts = Counter(data['id'] for _, data in valid if data['op'] != 'create')
+        duplicates = {task_id for task_id, count in id_counts.items() if count > 1}
+        if duplicates:
+            for index, data in valid:
+                if data['op'] != 'create' and data['id'] in duplicates:
+                    results[index] = {
+                        'status': 400,
+                        'errors': {'id': 'Task appears more than once in this request'},
+                    }
+            valid = [(index, data) for index, data in valid if results[index] is None]
+
+        project_ids = accessible_project_ids(request.user)
+        with transaction.atomic():
+            # Lock the rows being changed until the batch is applied.
+            tasks = Task.objects.select_for_update().filter(project_id__in=project_ids).in_bulk(
+                [data['id'] for _, data in valid if data['op'] != 'create']
+            )
+
+            # Resolve every (project, assignee) pair of the batch with one query.
+            pairs = set()
+            for _, data in valid:
+                if data.get('assigned_to_id'):
+                    project_id = data['project'] if data['op'] == 'create' else getattr(
+                        tasks.get(data['id']), 'project_id', None
+                    )
+                    pairs.add((project_id, data['assigned_to_id']))
+            memberships = set(ProjectMember.objects.filter(
+                project_id__in={project_id for project_id, _ in pairs},
+                user_id__in={user_id for _, user_id in pairs},
+            ).values_list('project_id', 'user_id')) if pairs else set()
+
+            to_create, to_update, to_delete = [], [], []
+            update_fields = set()
+            for index, data in valid:
+                op = data.pop('op')
+                if op == 'create':
+                    if data['project'] not in project_ids:
+                        results[index] = {'status': 404, 'errors': {'project': 'Project not found'}}
+                        continue
+                    task = Task(project_id=data.pop('project'))
+                else:
+                    task = tasks.get(data.pop('id'))
+                    if task is None:
+                        results[index] = {'status': 404, 'errors': {'id': 'Task not found'}}
+                        continue
+
+                reassign = 'assigned_to_id' in data
+                assigned_to_id = data.pop('assigned_to_id', None)
+                if assigned_to_id and (task.project_id, assigned_to_id) not in memberships:
+                    results[index] = {
+                        'status': 400,
+                        'errors': {'assigned_to_id': 'User must be a member of the project'},
+                    }
+                    continue
+
+                if op == 'delete':
+                    to_delete.append((index, task))
+                    continue
+                if reassign:
+                    task.assigned_to_id = assigned_to_id or None
+                    update_fields.add('assigned_to')
+                for field, value in data.items():
+                    setattr(task, field, value)
+                # bulk_create/bulk_update bypass Task.save().
+                task.priority_rank = Task.rank_priority(task.priority)
+                if op == 'create':
+                    to_create.append((index, task))
+                else:
+                    # bulk_update() does not apply auto_now.
+                    task.updated_at = timezone.now()
+                    update_fields.update(data)
+                    update_fields.add('updated_at')
+                    if 'priority' in data:
+                        update_fields.add('priority_rank')
+                    to_update.append((index, task))
+
+            Task.objects.bulk_create([task for _, task in to_create])
+            if to_update:
+                Task.objects.bulk_update([task for _, task in to_update], sorted(update_fields))
+            if to_delete:
+                Task.objects.filter(id__in=[task.id for _, task in to_delete]).delete()
+            # bulk_create/bulk_update do not send post_save.
+            changed = [task for _, task in to_create + to_update]
+            if changed:
+                tasks_bulk_saved.send(sender=Task, tasks=changed)
+
+        context = self.get_serializer_context()
+        for status_code, items in ((201, to_create), (200, to_update)):
+            data = TaskSerializer([task for _, task in items], many=True, context=context).data
+            for (index, task), item in zip(items, data):
+                results[index] = {'status': status_code, 'id': task.id, 'data': item}
+        for index, task in to_delete:
+            results[index] = {'status': 204, 'id': task.id}
+
+        return Response({'results': results})